@@ -336,6 +336,10 @@ class Controller:
                     for attr in mutable_platform_attrs:
                         if hasattr(im_cfg, attr) and hasattr(latest_platform_config, attr):
                             setattr(im_cfg, attr, getattr(latest_platform_config, attr))
+                    # Clients that precompute lookups from these attrs rebuild them here.
+                    reload_allowlists = getattr(client, "reload_allowlists", None)
+                    if callable(reload_allowlists):
+                        reload_allowlists()
 
                 self._config_mtime = mtime
         except Exception as err:
@@ -528,6 +532,9 @@ class Controller:
         """
         logger.info("IM client ready, checking for active polls to restore...")
         opencode_agent = self.agent_service.agents.get("opencode")
+        prewarm = getattr(opencode_agent, "prewarm", None)
+        if callable(prewarm):
+            prewarm()
         if opencode_agent and hasattr(opencode_agent, "restore_active_polls"):
             try:
                 restored = await opencode_agent.restore_active_polls()  # type: ignore[attr-defined]
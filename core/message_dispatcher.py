@@ -411,6 +411,15 @@ class ConsolidatedMessageDispatcher:
         chunks = self._split_result_text_by_bytes(text, max_bytes)
         first_message_id: Optional[str] = None
 
+        send_many = getattr(im_client, "send_many", None)
+        if len(chunks) > 1 and callable(send_many):
+            try:
+                message_ids = await send_many(target_context, chunks)
+            except Exception as err:
+                logger.error("Failed to send Log Message: %s", err, exc_info=True)
+                return None
+            return message_ids[0] if message_ids else None
+
         for chunk in chunks:
             try:
                 message_id = await im_client.send_message(target_context, chunk, parse_mode="markdown")
@@ -22,6 +22,7 @@ from .message_processor import OpenCodeMessageProcessorMixin
 from .poll_loop import OpenCodePollLoop
 from .server import OpenCodeServerManager
 from .session import OpenCodeResumeUnavailableError, OpenCodeSessionManager
+from .types import RequestSessionInfo
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +53,30 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
         self._poll_loop = OpenCodePollLoop(self)
 
         self._active_requests: Dict[str, asyncio.Task] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
 
     async def _get_server(self) -> OpenCodeServerManager:
         return await self._client_manager.get_server()
 
+    def prewarm(self) -> None:
+        """Start the OpenCode server in the background on the running loop.
+
+        The first message would otherwise pay the whole server boot on its
+        critical path. ``ensure_running`` serializes on the server lock, so a
+        request arriving mid-boot simply waits for this startup to finish.
+        """
+
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self._prewarm())
+
+    async def _prewarm(self) -> None:
+        try:
+            server = await self._get_server()
+            await server.ensure_running()
+        except Exception as e:
+            # Not fatal: the next request retries and reports the error.
+            logger.warning(f"OpenCode server prewarm failed: {e}")
+
     async def refresh_runtime_config(self, opencode_config) -> None:
         """Reload runtime config and refresh the shared server.
 
@@ -119,8 +140,10 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
                 req_info = self._session_manager.get_request_session(request.base_session_id)
                 if req_info:
                     server = await self._get_server()
-                    await server.abort_session(req_info[0], req_info[1])
-                    await self._session_manager.wait_for_session_idle(server, req_info[0], req_info[1])
+                    await server.abort_session(req_info.opencode_session_id, req_info.working_path)
+                    await self._session_manager.wait_for_session_idle(
+                        server, req_info.opencode_session_id, req_info.working_path
+                    )
 
                 existing_task.cancel()
                 try:
@@ -144,9 +167,7 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
         except asyncio.CancelledError:
             logger.debug(f"OpenCode task cancelled for {request.base_session_id}")
         finally:
-            if self._active_requests.get(request.base_session_id) is task:
-                self._active_requests.pop(request.base_session_id, None)
-                self._session_manager.pop_request_session(request.base_session_id)
+            self._release_active_request(request.base_session_id, task)
             # The poll loop ran to completion above (handle_message awaits the
             # task), so the turn is fully settled here. Release any web-Chat
             # stream waiter: a no-result failure (only a notify was emitted)
@@ -228,88 +249,33 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
         self._session_manager.mark_initialized(session_id)
 
         try:
-            override_agent, override_model, override_reasoning = self.controller.get_opencode_overrides(request.context)
-            override_model = request.vibe_agent_model or override_model
-            override_reasoning = request.vibe_agent_reasoning_effort or override_reasoning
-
-            override_agent = request.subagent_name or override_agent
-            if request.subagent_name:
-                override_model = request.subagent_model
-                override_reasoning = request.subagent_reasoning_effort
-
-            if request.subagent_name and not override_model:
-                override_model = server.get_agent_model_from_config(request.subagent_name)
-            if request.subagent_name and not override_reasoning:
-                override_reasoning = server.get_agent_reasoning_effort_from_config(request.subagent_name)
-
-            agent_to_use = override_agent
-            if not agent_to_use:
-                agent_to_use = server.get_default_agent_from_config()
-
-            model_dict = None
-            model_str = override_model
-            if not model_str:
-                model_str = server.get_agent_model_from_config(agent_to_use)
-            opencode_cfg = getattr(self.controller.config, "opencode", None)
-            if not model_str:
-                model_str = getattr(opencode_cfg, "default_model", None)
-            # Bare model id (no ``provider/`` prefix): only inject ``providerID``
-            # when the user has explicitly chosen a default provider in Settings.
-            # Otherwise leave ``model_dict`` unset so OpenCode keeps using its own
-            # routing for legacy installs.
-            default_provider = getattr(opencode_cfg, "default_provider", None)
-            model_dict = resolve_opencode_model_dict(model_str, default_provider)
-
-            reasoning_effort = override_reasoning
-            if not reasoning_effort:
-                reasoning_effort = server.get_agent_reasoning_effort_from_config(agent_to_use)
-            if not reasoning_effort:
-                reasoning_effort = getattr(opencode_cfg, "default_reasoning_effort", None)
-
-            baseline_message_ids: set[str] = set()
+            agent_to_use, model_dict, reasoning_effort = self._resolve_prompt_options(request, server)
+            baseline_message_ids = await self._snapshot_message_ids(server, session_id, request.working_path)
+            # Prepare message with file attachment info if present
+            prompt_text = self._prepare_message_with_files(request)
+            system_prompt_injection = self._build_system_prompt(request)
+
+            unchecked = self._session_manager.pop_unchecked_session(session_id)
             try:
-                baseline_messages = await server.list_messages(
+                await server.prompt_async(
                     session_id=session_id,
                     directory=request.working_path,
+                    text=prompt_text,
+                    agent=agent_to_use,
+                    model=model_dict,
+                    reasoning_effort=reasoning_effort,
+                    system=system_prompt_injection,
+                    tools={"question": False},
                 )
-                for message in baseline_messages:
-                    message_id = message.get("info", {}).get("id")
-                    if message_id:
-                        baseline_message_ids.add(message_id)
-            except Exception as err:
-                logger.debug(f"Failed to snapshot OpenCode messages before prompt: {err}")
-
-            # Prepare message with file attachment info if present
-            prompt_text = self._prepare_message_with_files(request)
-            platform = (
-                request.context.platform
-                or (request.context.platform_specific or {}).get("platform")
-                or self.controller.config.platform
-            )
-
-            system_prompt_injection = build_system_prompt_injection(
-                include_quick_replies=getattr(self.controller.config, "reply_enhancements", True)
-                and platform != "wechat",
-                include_show_pages=getattr(self.controller.config, "show_pages_prompt", True),
-                avibe_cloud_connected=avibe_cloud_url_available(self.controller.config),
-                context=request.context,
-                fallback_platform=platform,
-                enabled_agents=get_enabled_agents_for_prompt(self.controller),
-                current_agent_backend="opencode",
-            )
-            if request.vibe_agent_system_prompt:
-                system_prompt_injection = f"{request.vibe_agent_system_prompt}\n\n{system_prompt_injection}"
-
-            await server.prompt_async(
-                session_id=session_id,
-                directory=request.working_path,
-                text=prompt_text,
-                agent=agent_to_use,
-                model=model_dict,
-                reasoning_effort=reasoning_effort,
-                system=system_prompt_injection,
-                tools={"question": False},
-            )
+            except Exception:
+                # The verification GET may have been skipped on the hit path;
+                # forget it, and re-check once so a session the server dropped
+                # reports expiry on this message instead of a generic failure.
+                self._session_manager.forget_verified(session_id)
+                if unchecked and not await self._session_still_exists(server, session_id, request.working_path):
+                    raise OpenCodeResumeUnavailableError(session_id)
+                raise
+            self._session_manager.mark_verified(session_id)
             await server.mark_run_active(session_id)
             run_registered = True
 
@@ -381,6 +347,10 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
             self._maybe_backfill_session_title(request, session_id, retry_delay_seconds=3.0)
             self.sessions.remove_active_poll(session_id)
 
+        except OpenCodeResumeUnavailableError as e:
+            # Same terminal error result as the acquisition path above.
+            await self.controller.emit_agent_message(request.context, "result", f"❌ {e}", is_error=True)
+            await self._remove_ack_reaction(request)
         except asyncio.CancelledError:
             logger.info(f"OpenCode request cancelled for {request.base_session_id}")
             await self._remove_ack_reaction(request)
@@ -425,6 +395,103 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
             if run_registered:
                 await server.mark_run_inactive(session_id)
 
+    async def _session_still_exists(self, server: OpenCodeServerManager, session_id: str, directory: str) -> bool:
+        """Re-check a session after a failed prompt; unknown counts as present."""
+
+        try:
+            return bool(await server.get_session(session_id, directory, raise_on_error=True))
+        except Exception as err:
+            logger.debug("OpenCode session re-check failed for %s: %s", session_id, err)
+            return True
+
+    def _resolve_prompt_options(
+        self, request: AgentRequest, server: OpenCodeServerManager
+    ) -> tuple[Optional[str], Optional[dict[str, str]], Optional[str]]:
+        """Resolve the agent, model and reasoning effort for this prompt."""
+
+        override_agent, override_model, override_reasoning = self.controller.get_opencode_overrides(request.context)
+        override_model = request.vibe_agent_model or override_model
+        override_reasoning = request.vibe_agent_reasoning_effort or override_reasoning
+
+        override_agent = request.subagent_name or override_agent
+        if request.subagent_name:
+            override_model = request.subagent_model
+            override_reasoning = request.subagent_reasoning_effort
+
+        if request.subagent_name and not override_model:
+            override_model = server.get_agent_model_from_config(request.subagent_name)
+        if request.subagent_name and not override_reasoning:
+            override_reasoning = server.get_agent_reasoning_effort_from_config(request.subagent_name)
+
+        agent_to_use = override_agent
+        if not agent_to_use:
+            agent_to_use = server.get_default_agent_from_config()
+
+        model_str = override_model
+        if not model_str:
+            model_str = server.get_agent_model_from_config(agent_to_use)
+        opencode_cfg = getattr(self.controller.config, "opencode", None)
+        if not model_str:
+            model_str = getattr(opencode_cfg, "default_model", None)
+        # Bare model id (no ``provider/`` prefix): only inject ``providerID``
+        # when the user has explicitly chosen a default provider in Settings.
+        # Otherwise leave ``model_dict`` unset so OpenCode keeps using its own
+        # routing for legacy installs.
+        default_provider = getattr(opencode_cfg, "default_provider", None)
+        model_dict = resolve_opencode_model_dict(model_str, default_provider)
+
+        reasoning_effort = override_reasoning
+        if not reasoning_effort:
+            reasoning_effort = server.get_agent_reasoning_effort_from_config(agent_to_use)
+        if not reasoning_effort:
+            reasoning_effort = getattr(opencode_cfg, "default_reasoning_effort", None)
+
+        return agent_to_use, model_dict, reasoning_effort
+
+    async def _snapshot_message_ids(
+        self, server: OpenCodeServerManager, session_id: str, working_path: str
+    ) -> set[str]:
+        """Collect the ids already in the session so the poll loop skips them."""
+
+        baseline_message_ids: set[str] = set()
+        # A session created for this very message has no history yet, so
+        # skip the snapshot round-trip on the first-message path.
+        if self._session_manager.pop_fresh_session(session_id):
+            return baseline_message_ids
+        try:
+            baseline_messages = await server.list_messages(
+                session_id=session_id,
+                directory=working_path,
+            )
+            for message in baseline_messages:
+                message_id = message.get("info", {}).get("id")
+                if message_id:
+                    baseline_message_ids.add(message_id)
+        except Exception as err:
+            logger.debug(f"Failed to snapshot OpenCode messages before prompt: {err}")
+        return baseline_message_ids
+
+    def _build_system_prompt(self, request: AgentRequest) -> str:
+        platform = (
+            request.context.platform
+            or (request.context.platform_specific or {}).get("platform")
+            or self.controller.config.platform
+        )
+
+        system_prompt_injection = build_system_prompt_injection(
+            include_quick_replies=getattr(self.controller.config, "reply_enhancements", True)
+            and platform != "wechat",
+            include_show_pages=getattr(self.controller.config, "show_pages_prompt", True),
+            avibe_cloud_connected=avibe_cloud_url_available(self.controller.config),
+            context=request.context,
+            fallback_platform=platform,
+            enabled_agents=get_enabled_agents_for_prompt(self.controller),
+            current_agent_backend="opencode",
+        )
+        if request.vibe_agent_system_prompt:
+            system_prompt_injection = f"{request.vibe_agent_system_prompt}\n\n{system_prompt_injection}"
+        return system_prompt_injection
+
     async def handle_stop(self, request: AgentRequest) -> bool:
         task = self._active_requests.get(request.base_session_id)
         if not task or task.done():
@@ -434,10 +501,10 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
         req_info = self._session_manager.get_request_session(request.base_session_id)
         opencode_session_id = None
         if req_info:
-            opencode_session_id = req_info[0]
+            opencode_session_id = req_info.opencode_session_id
             try:
                 server = await self._get_server()
-                await server.abort_session(req_info[0], req_info[1])
+                await server.abort_session(opencode_session_id, req_info.working_path)
             except Exception as e:
                 logger.warning(f"Failed to abort OpenCode session: {e}")
 
@@ -460,25 +527,33 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
 
     async def clear_sessions(self, session_key: str) -> int:
         self.sessions.clear_agent_sessions(session_key, self.name)
-        terminated = 0
+        running = []
         for base_id, task in list(self._active_requests.items()):
             req_info = self._session_manager.get_request_session(base_id)
-            if req_info and len(req_info) >= 3 and req_info[2] == session_key:
-                opencode_session_id = req_info[0]
+            if req_info and req_info.session_key == session_key:
                 if not task.done():
-                    try:
-                        server = await self._get_server()
-                        await server.abort_session(req_info[0], req_info[1])
-                    except Exception:
-                        pass
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-                    terminated += 1
-                self.sessions.remove_active_poll(opencode_session_id)
-        return terminated
+                    running.append(self._abort_and_cancel(task, req_info))
+                else:
+                    self.sessions.remove_active_poll(req_info.opencode_session_id)
+        # Abort every run at once: each is an independent HTTP round-trip plus
+        # a task teardown, so clearing N sessions costs ~1 RTT instead of N.
+        results = await asyncio.gather(*running, return_exceptions=True)
+        return sum(1 for result in results if result is True)
+
+    async def _abort_and_cancel(self, task: asyncio.Task, req_info: RequestSessionInfo) -> bool:
+        try:
+            server = await self._get_server()
+            await server.abort_session(req_info.opencode_session_id, req_info.working_path)
+        except Exception:
+            pass
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.sessions.remove_active_poll(req_info.opencode_session_id)
+        return True
 
     async def _delete_ack(self, request: AgentRequest) -> None:
         service = getattr(self.controller, "processing_indicator", None)
@@ -604,9 +679,18 @@ class OpenCodeAgent(OpenCodeMessageProcessorMixin, BaseAgent):
             await self._poll_loop.run_restored_poll_loop(poll_info)
         finally:
             await server.mark_run_inactive(poll_info.opencode_session_id)
-            if self._active_requests.get(poll_info.base_session_id) is current_task:
-                self._active_requests.pop(poll_info.base_session_id, None)
-                self._session_manager.pop_request_session(poll_info.base_session_id)
+            self._release_active_request(poll_info.base_session_id, current_task)
+
+    def _release_active_request(self, base_session_id: str, task: Optional[asyncio.Task]) -> None:
+        """Drop the tracking for ``task`` unless a newer request replaced it.
+
+        A new request installs its task before the cancelled predecessor's
+        cleanup runs, so only the owner may clear the slot. There is no await
+        between the ownership check and the pops, so the check cannot race.
+        """
+        if task is not None and self._active_requests.get(base_session_id) is task:
+            del self._active_requests[base_session_id]
+            self._session_manager.pop_request_session(base_session_id)
 
     def _prepare_message_with_files(self, request: AgentRequest) -> str:
         """Prepare message with file attachment information.
@@ -4,11 +4,17 @@ from __future__ import annotations
 
 import logging
 import os
+from functools import lru_cache
 from typing import Any, Dict, Mapping
 
 logger = logging.getLogger(__name__)
 
 
+def _stripped_part_text(part: Mapping[str, Any]) -> str:
+    text = part.get("text")
+    return text.strip() if isinstance(text, str) else ""
+
+
 def extract_opencode_response_text(
     response: Mapping[str, Any],
     *,
@@ -16,29 +22,56 @@ def extract_opencode_response_text(
 ) -> str:
     """Extract user-visible assistant text from an OpenCode message."""
     parts = response.get("parts", [])
-    text_parts: list[str] = []
-    fallback_parts: list[str] = []
-
     if not isinstance(parts, list):
         return ""
 
-    for part in parts:
-        if not isinstance(part, dict):
-            continue
-        text = part.get("text")
-        if not isinstance(text, str) or not text.strip():
-            continue
-        cleaned = text.strip()
-        if part.get("type") == "text":
-            text_parts.append(cleaned)
-        else:
-            fallback_parts.append(cleaned)
-
-    if text_parts:
-        return "\n\n".join(text_parts).strip()
-    if allow_non_text_fallback:
-        return "\n\n".join(fallback_parts).strip()
-    return ""
+    # Joined pieces are already stripped and non-empty, so the result needs no
+    # final strip. The non-text pass only runs when no text part had content.
+    text = "\n\n".join(
+        cleaned
+        for part in parts
+        if isinstance(part, dict) and part.get("type") == "text" and (cleaned := _stripped_part_text(part))
+    )
+    if text or not allow_non_text_fallback:
+        return text
+    return "\n\n".join(
+        cleaned
+        for part in parts
+        if isinstance(part, dict) and part.get("type") != "text" and (cleaned := _stripped_part_text(part))
+    )
+
+
+def normalize_cwd(cwd: str) -> str:
+    """Normalize a working directory once so per-path conversions can skip it."""
+
+    return os.path.abspath(os.path.expanduser(cwd))
+
+
+def relative_path_under(abs_path: str, cwd_abs: str) -> str:
+    """Convert ``abs_path`` to a ``./``-relative path under a normalized cwd.
+
+    Tool calls in one turn keep touching the same handful of files, so the
+    result is cached per (path, cwd) pair. Tool input is not type-checked
+    upstream; anything that is not a string is returned unchanged.
+    """
+
+    if not isinstance(abs_path, str):
+        return abs_path
+    return _relative_path_under(abs_path, cwd_abs)
+
+
+@lru_cache(maxsize=1024)
+def _relative_path_under(abs_path: str, cwd_abs: str) -> str:
+    try:
+        abs_path = os.path.abspath(os.path.expanduser(abs_path))
+        rel_path = os.path.relpath(abs_path, cwd_abs)
+        if rel_path.startswith("../.."):  # outside workspace
+            return abs_path
+        if not rel_path.startswith(".") and rel_path != ".":
+            rel_path = "./" + rel_path
+        return rel_path
+    except Exception:
+        return abs_path
 
 
 class OpenCodeMessageProcessorMixin:
@@ -46,9 +79,11 @@ class OpenCodeMessageProcessorMixin:
 
     def _extract_response_text(self, response: Dict[str, Any]) -> str:
         text = extract_opencode_response_text(response)
-        parts = response.get("parts", [])
+        if text or not logger.isEnabledFor(logging.INFO):
+            return text
 
-        if not text and isinstance(parts, list) and parts:
+        parts = response.get("parts", [])
+        if isinstance(parts, list) and parts:
             part_types = [p.get("type") for p in parts if isinstance(p, dict)]
             msg_id = response.get("info", {}).get("id", "unknown")
             logger.info(
@@ -64,13 +99,6 @@ class OpenCodeMessageProcessorMixin:
         """Convert absolute file paths to relative paths under cwd."""
 
         try:
-            abs_path = os.path.abspath(os.path.expanduser(abs_path))
-            cwd = os.path.abspath(os.path.expanduser(cwd))
-            rel_path = os.path.relpath(abs_path, cwd)
-            if rel_path.startswith("../.."):  # outside workspace
-                return abs_path
-            if not rel_path.startswith(".") and rel_path != ".":
-                rel_path = "./" + rel_path
-            return rel_path
+            return relative_path_under(abs_path, cwd_abs=normalize_cwd(cwd))
         except Exception:
             return abs_path
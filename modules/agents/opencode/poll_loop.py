@@ -5,17 +5,35 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from functools import partial
+from itertools import islice
 from typing import Any, Dict, Optional
 
 from config.v2_config import DEFAULT_OPENCODE_ERROR_RETRY_LIMIT
 from modules.agents.base import AgentRequest
 from vibe.i18n import t as i18n_t
 
+from .message_processor import normalize_cwd, relative_path_under
 from .server import OpenCodeServerManager
 
 logger = logging.getLogger(__name__)
 
 
+def _first_new_message_index(messages: list[Dict[str, Any]], baseline_message_ids: set[str]) -> int:
+    """Return the index of the first message newer than the pre-prompt snapshot.
+
+    OpenCode only appends to a session, so the baseline ids form a prefix of
+    the message list. Walking back from the end and stopping at the newest
+    baseline message avoids re-testing the whole history on every poll.
+    """
+    if not baseline_message_ids:
+        return 0
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].get("info", {}).get("id") in baseline_message_ids:
+            return index + 1
+    return 0
+
+
 class OpenCodePollLoop:
     def __init__(self, agent):
         self._agent = agent
@@ -139,8 +157,11 @@ class OpenCodePollLoop:
         )
         last_error_message_id: Optional[str] = None
 
-        def _relative_path(path: str) -> str:
-            return self._agent._to_relative_path(path, request.working_path)
+        # Resolved once per turn: the tool-part loop below runs for every part
+        # of every poll, so keep attribute chains and cwd normalization out of it.
+        relative_path = partial(relative_path_under, cwd_abs=normalize_cwd(request.working_path))
+        format_toolcall = self._agent._get_formatter(request.context).format_toolcall
+        emit_agent_message = self._agent.controller.emit_agent_message
 
         poll_iter = 0
         while True:
@@ -167,7 +188,8 @@ class OpenCodePollLoop:
                 await asyncio.sleep(poll_interval_seconds)
                 continue
 
-            for message in messages:
+            first_new = _first_new_message_index(messages, baseline_message_ids)
+            for message in islice(messages, first_new, None):
                 info = message.get("info", {})
                 message_id = info.get("id")
                 if not message_id or message_id in baseline_message_ids:
@@ -197,12 +219,12 @@ class OpenCodePollLoop:
                             logger.warning("Failed to abort disabled question session %s: %s", session_id, abort_err)
                         return None, False
 
-                    toolcall = self._agent._get_formatter(request.context).format_toolcall(
+                    toolcall = format_toolcall(
                         tool_name,
                         tool_input,
-                        get_relative_path=_relative_path,
+                        get_relative_path=relative_path,
                     )
-                    await self._agent.controller.emit_agent_message(
+                    await emit_agent_message(
                         request.context,
                         "toolcall",
                         toolcall,
@@ -217,7 +239,7 @@ class OpenCodePollLoop:
                 ):
                     text = self._agent._extract_response_text(message)
                     if text:
-                        await self._agent.controller.emit_agent_message(
+                        await emit_agent_message(
                             request.context,
                             "assistant",
                             text,
@@ -356,8 +378,7 @@ class OpenCodePollLoop:
 
         started_at = time.monotonic()
 
-        def _relative_path(path: str) -> str:
-            return self._agent._to_relative_path(path, poll_info.working_path)
+        relative_path = partial(relative_path_under, cwd_abs=normalize_cwd(poll_info.working_path))
 
         try:
             poll_iter = 0
@@ -385,7 +406,8 @@ class OpenCodePollLoop:
                     await asyncio.sleep(poll_interval_seconds)
                     continue
 
-                for message in messages:
+                first_new = _first_new_message_index(messages, baseline_message_ids)
+                for message in islice(messages, first_new, None):
                     info = message.get("info", {})
                     message_id = info.get("id")
                     if not message_id or message_id in baseline_message_ids:
@@ -443,7 +465,7 @@ class OpenCodePollLoop:
                             elif tool_name in ("read", "write", "edit"):
                                 path = tool_input.get("file_path") or tool_input.get("path", "")
                                 if path:
-                                    tool_summary = f"`{tool_name}`: `{_relative_path(path)}`"
+                                    tool_summary = f"`{tool_name}`: `{relative_path(path)}`"
 
                             await self._agent.controller.emit_agent_message(context, "tool_call", tool_summary)
 
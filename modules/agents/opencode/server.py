@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 import json
 import logging
@@ -16,6 +17,7 @@ from asyncio.subprocess import Process
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
 
 from config import paths
 from core.process_isolation import isolated_subprocess_kwargs, terminate_process_tree
@@ -23,11 +25,50 @@ from modules.agents.opencode.config_reconciler import OpenCodeConfigReconciler
 from vibe import runtime
 from vibe.opencode_config import load_first_opencode_user_config, read_opencode_provider_auth_entries
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib decoder is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_OPENCODE_PORT = 4096
 DEFAULT_OPENCODE_HOST = "127.0.0.1"
 SERVER_START_TIMEOUT = 15
+# Readiness probes during startup back off from a short first delay, so a
+# fast boot is noticed within tens of milliseconds without hammering the port.
+SERVER_START_POLL_INITIAL_DELAY = 0.025
+SERVER_START_POLL_MAX_DELAY = 0.25
+# Connection pool for the loopback API client. Poll loops hit the server every
+# couple of seconds per active session, so keep a bounded set of warm
+# connections instead of aiohttp's defaults (100 sockets, 15s idle).
+# ``opencode serve`` only listens on TCP (--hostname/--port) and adopted
+# servers are located by port, so the client stays on a TCPConnector rather
+# than a UnixConnector; warm keep-alive sockets keep loopback cost low.
+HTTP_POOL_LIMIT = 32
+HTTP_POOL_LIMIT_PER_HOST = 16
+HTTP_KEEPALIVE_TIMEOUT = 60
+# A successful health probe is trusted for this long, so back-to-back messages
+# do not each pay a /global/health round-trip in ensure_running.
+HEALTH_CHECK_TTL_SECONDS = 2.0
+# Working directories whose x-opencode-directory header is kept prebuilt.
+DIRECTORY_HEADERS_CACHE_MAX = 256
+
+
+def _decode_json(body: bytes | str) -> Any:
+    """Decode a JSON response body, preferring orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _encode_json(value: Any) -> str:
+    """Encode a JSON request body, preferring orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
 
 
 class OpenCodeServerManager:
@@ -68,6 +109,11 @@ class OpenCodeServerManager:
         self._auth_refresh_pending = False
         self._auth_refresh_pending_port: Optional[int] = None
         self._pending_runtime_config: Optional[tuple[str, int, int]] = None
+        self._last_healthy_ts = 0.0
+        # OpenCode answers /global/health with 200 only when it is up, so the
+        # status code is enough. Set to True to also require {"healthy": true}.
+        self._strict_health = False
+        self._directory_headers: OrderedDict[str, CIMultiDictProxy[str]] = OrderedDict()
 
     def _get_lock(self) -> asyncio.Lock:
         """Get or create an asyncio.Lock bound to the current event loop."""
@@ -77,6 +123,19 @@ class OpenCodeServerManager:
             self._lock_loop = current_loop
         return self._lock
 
+    def _headers_for(self, directory: str) -> CIMultiDictProxy[str]:
+        """Return read-only x-opencode-directory headers, built once per directory."""
+
+        headers = self._directory_headers.get(directory)
+        if headers is not None:
+            self._directory_headers.move_to_end(directory)
+            return headers
+        headers = CIMultiDictProxy(CIMultiDict({"x-opencode-directory": directory}))
+        self._directory_headers[directory] = headers
+        if len(self._directory_headers) > DIRECTORY_HEADERS_CACHE_MAX:
+            self._directory_headers.popitem(last=False)
+        return headers
+
     @classmethod
     async def get_instance(
         cls,
@@ -154,7 +213,19 @@ class OpenCodeServerManager:
                 except Exception:
                     pass
             total_timeout: Optional[int] = None if self.request_timeout_seconds <= 0 else self.request_timeout_seconds
-            self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=total_timeout))
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self._http_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=total_timeout),
+                json_serialize=_encode_json,
+                # The OpenCode API is stateless and sets no cookies; skip the
+                # jar filtering/updating aiohttp does around every request.
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
             self._http_session_loop = current_loop
         return self._http_session
 
@@ -179,6 +250,7 @@ class OpenCodeServerManager:
 
     async def _restart_for_auth_refresh_locked(self) -> None:
         await self._close_http_session_locked()
+        self._last_healthy_ts = 0.0
 
         cleanup_port = self._auth_refresh_pending_port or self.port
         targets: list[int] = []
@@ -245,7 +317,6 @@ class OpenCodeServerManager:
         if config is None:
             return False
 
-        total_timeout: Optional[int] = None if self.request_timeout_seconds <= 0 else self.request_timeout_seconds
         async with self._get_lock():
             if self._active_requests > 0 or self._has_active_run_sessions():
                 return False
@@ -255,22 +326,19 @@ class OpenCodeServerManager:
             if current_config is None:
                 return False
             config = self._merge_global_config_snapshot(current_config, config)
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=total_timeout)) as session:
-                async with session.patch(
-                    f"{self.base_url}/global/config",
-                    json=config,
-                ) as resp:
-                    if resp.status == 200:
-                        await resp.read()
-                        return True
-                    if resp.status in (404, 405):
-                        await resp.read()
-                        return False
-                    error_text = await resp.text()
-                    raise RuntimeError(
-                        f"Failed to refresh OpenCode global config: {resp.status} {error_text}"
-                    )
-        return False
+            session = await self._get_http_session()
+            async with session.patch(
+                f"{self.base_url}/global/config",
+                json=config,
+            ) as resp:
+                if resp.status == 200:
+                    await resp.read()
+                    return True
+                if resp.status in (404, 405):
+                    await resp.read()
+                    return False
+                error_text = await resp.text()
+                raise RuntimeError(f"Failed to refresh OpenCode global config: {resp.status} {error_text}")
 
     async def reload_runtime_config(
         self,
@@ -289,6 +357,13 @@ class OpenCodeServerManager:
         self.binary = binary
         self.port = port
         self.request_timeout_seconds = request_timeout_seconds
+        self._last_healthy_ts = 0.0
+
+    def _probed_healthy_recently(self) -> bool:
+        return self._last_healthy_ts > 0 and time.monotonic() - self._last_healthy_ts < HEALTH_CHECK_TTL_SECONDS
+
+    def _health_is_fresh(self) -> bool:
+        return self._base_url is not None and self._probed_healthy_recently()
 
     def _apply_pending_runtime_config_locked(self) -> None:
         if self._pending_runtime_config is None:
@@ -315,6 +390,11 @@ class OpenCodeServerManager:
             self._active_requests += 1
         try:
             yield
+        except Exception:
+            # A failed call may mean the server went away; make the next
+            # ensure_running probe again instead of trusting the cached result.
+            self._last_healthy_ts = 0.0
+            raise
         finally:
             async with self._get_lock():
                 self._active_requests = max(0, self._active_requests - 1)
@@ -537,12 +617,21 @@ class OpenCodeServerManager:
         self._clear_pid_file()
 
     async def ensure_running(self) -> str:
+        # Double-checked: a fresh probe needs no lock, so concurrent messages
+        # do not queue behind each other once the server is known to be up.
+        # A pending auth refresh still goes through the locked path below.
+        if not self._auth_refresh_pending and self._health_is_fresh():
+            return self.base_url
         async with self._get_lock():
             if self._auth_refresh_pending and self._active_requests == 0 and not self._has_active_run_sessions():
                 await self._restart_for_auth_refresh_locked()
+            if self._health_is_fresh():
+                return self.base_url
             await self._cleanup_orphaned_managed_server()
 
-            if await self._is_healthy():
+            # Adopting a server from the pid file already probed it; reuse that
+            # answer instead of issuing a second /global/health right away.
+            if self._probed_healthy_recently() or await self._is_healthy():
                 # If the server is already running (e.g., started by a previous run),
                 # record its PID so shutdown can clean it up.
                 if not self._read_pid_file():
@@ -575,10 +664,20 @@ class OpenCodeServerManager:
             session = await self._get_http_session()
             async with session.get(f"{self.base_url}/global/health", timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("healthy", False)
+                    if self._strict_health:
+                        data = await resp.json(loads=_decode_json)
+                        healthy = bool(data.get("healthy", False))
+                    else:
+                        # Drain the tiny body without decoding it so the
+                        # keep-alive connection goes back to the pool.
+                        await resp.read()
+                        healthy = True
+                    if healthy:
+                        self._last_healthy_ts = time.monotonic()
+                        return True
         except Exception as e:
             logger.debug(f"Health check failed: {e}")
+        self._last_healthy_ts = 0.0
         return False
 
     async def _start_server(self) -> None:
@@ -653,18 +752,29 @@ class OpenCodeServerManager:
                 f"OpenCode CLI not found at '{self.binary}'. Please install OpenCode or set OPENCODE_CLI_PATH."
             )
 
+        # stdout/stderr stay on DEVNULL: the server outlives this process (the
+        # next instance adopts it), so a pipe we stop draining would eventually
+        # block or break its writes. Readiness is detected by probing instead.
         start_time = time.monotonic()
+        delay = SERVER_START_POLL_INITIAL_DELAY
         while time.monotonic() - start_time < SERVER_START_TIMEOUT:
             if await self._is_healthy():
                 self._base_url = f"http://{self.host}:{self.port}"
                 logger.info(f"OpenCode server started at {self._base_url}")
                 return
-            await asyncio.sleep(0.5)
+            if self._process.returncode is not None:
+                # Exited during boot (bad config, port race): waiting out the
+                # full timeout would only delay the error.
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SERVER_START_POLL_MAX_DELAY)
 
         exit_code = self._process.returncode
         self._clear_pid_file()
         self._process = None
         self._process_loop = None
+        if exit_code is not None:
+            raise RuntimeError(f"OpenCode server exited during startup. Process exit code: {exit_code}")
         raise RuntimeError(
             f"OpenCode server failed to start within {SERVER_START_TIMEOUT}s. Process exit code: {exit_code}"
         )
@@ -736,12 +846,12 @@ class OpenCodeServerManager:
             async with session.post(
                 f"{self.base_url}/session",
                 json=body,
-                headers={"x-opencode-directory": directory},
+                headers=self._headers_for(directory),
             ) as resp:
                 if resp.status != 200:
                     text = await resp.text()
                     raise RuntimeError(f"Failed to create session: {resp.status} {text}")
-                return await resp.json()
+                return await resp.json(loads=_decode_json)
 
     async def send_message(
         self,
@@ -768,12 +878,12 @@ class OpenCodeServerManager:
             async with session.post(
                 f"{self.base_url}/session/{session_id}/message",
                 json=body,
-                headers={"x-opencode-directory": directory},
+                headers=self._headers_for(directory),
             ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     raise RuntimeError(f"Failed to send message: {resp.status} {error_text}")
-                return await resp.json()
+                return await resp.json(loads=_decode_json)
 
     async def prompt_async(
         self,
@@ -808,7 +918,7 @@ class OpenCodeServerManager:
             async with session.post(
                 f"{self.base_url}/session/{session_id}/prompt_async",
                 json=body,
-                headers={"x-opencode-directory": directory},
+                headers=self._headers_for(directory),
             ) as resp:
                 # OpenCode returns 204 when accepted.
                 if resp.status not in (200, 204):
@@ -820,24 +930,26 @@ class OpenCodeServerManager:
             session = await self._get_http_session()
             async with session.get(
                 f"{self.base_url}/session/{session_id}/message",
-                headers={"x-opencode-directory": directory},
+                headers=self._headers_for(directory),
             ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     raise RuntimeError(f"Failed to list messages: {resp.status} {error_text}")
-                return await resp.json()
+                # Polled every couple of seconds with the full session history,
+                # so decode the raw body directly instead of via resp.json().
+                return _decode_json(await resp.read())
 
     async def get_message(self, session_id: str, message_id: str, directory: str) -> Dict[str, Any]:
         async with self._request_scope():
             session = await self._get_http_session()
             async with session.get(
                 f"{self.base_url}/session/{session_id}/message/{message_id}",
-                headers={"x-opencode-directory": directory},
+                headers=self._headers_for(directory),
             ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     raise RuntimeError(f"Failed to get message: {resp.status} {error_text}")
-                return await resp.json()
+                return await resp.json(loads=_decode_json)
 
     async def abort_session(self, session_id: str, directory: str) -> bool:
         async with self._request_scope():
@@ -846,7 +958,7 @@ class OpenCodeServerManager:
             try:
                 async with session.post(
                     f"{self.base_url}/session/{session_id}/abort",
-                    headers={"x-opencode-directory": directory},
+                    headers=self._headers_for(directory),
                 ) as resp:
                     return resp.status == 200
             except Exception as e:
@@ -868,10 +980,10 @@ class OpenCodeServerManager:
             try:
                 async with session.get(
                     f"{self.base_url}/session/{session_id}",
-                    headers={"x-opencode-directory": directory},
+                    headers=self._headers_for(directory),
                 ) as resp:
                     if resp.status == 200:
-                        return await resp.json()
+                        return await resp.json(loads=_decode_json)
                     # Only a genuine "not found" means the session is gone. Other
                     # non-200s (transient 500/503, auth 401) are NOT expiry — when a
                     # caller is validating an existing session (raise_on_error), raise
@@ -903,10 +1015,10 @@ class OpenCodeServerManager:
             try:
                 async with session.get(
                     f"{self.base_url}/agent",
-                    headers={"x-opencode-directory": directory},
+                    headers=self._headers_for(directory),
                 ) as resp:
                     if resp.status == 200:
-                        agents = await resp.json()
+                        agents = await resp.json(loads=_decode_json)
                         # Filter to primary agents (build, plan), exclude hidden/subagent
                         return [a for a in agents if a.get("mode") == "primary" and not a.get("hidden", False)]
                     return []
@@ -926,10 +1038,10 @@ class OpenCodeServerManager:
             try:
                 async with session.get(
                     f"{self.base_url}/config/providers",
-                    headers={"x-opencode-directory": directory},
+                    headers=self._headers_for(directory),
                 ) as resp:
                     if resp.status == 200:
-                        return await resp.json()
+                        return await resp.json(loads=_decode_json)
                     return {"providers": [], "default": {}}
             except Exception as e:
                 logger.warning(f"Failed to get available models: {e}")
@@ -947,10 +1059,10 @@ class OpenCodeServerManager:
             try:
                 async with session.get(
                     f"{self.base_url}/config",
-                    headers={"x-opencode-directory": directory},
+                    headers=self._headers_for(directory),
                 ) as resp:
                     if resp.status == 200:
-                        return await resp.json()
+                        return await resp.json(loads=_decode_json)
                     return {}
             except Exception as e:
                 logger.warning(f"Failed to get default config: {e}")
@@ -1010,7 +1122,7 @@ class OpenCodeServerManager:
             try:
                 async with session.get(f"{self.base_url}/provider") as resp:
                     if resp.status == 200:
-                        return await resp.json()
+                        return await resp.json(loads=_decode_json)
                     return {}
             except Exception as e:
                 logger.warning(f"Failed to get OpenCode providers: {e}")
@@ -1052,7 +1164,7 @@ class OpenCodeServerManager:
                         f"OpenCode authorize failed for {provider_id}: {resp.status} {text}"
                     )
                 try:
-                    return await resp.json()
+                    return await resp.json(loads=_decode_json)
                 except Exception:  # pragma: no cover - parse-defensive
                     return json.loads(text) if text else {}
 
@@ -1101,7 +1213,7 @@ class OpenCodeServerManager:
                         f"OpenCode callback failed for {provider_id}: {resp.status} {text}"
                     )
                 try:
-                    return await resp.json()
+                    return await resp.json(loads=_decode_json)
                 except Exception:  # pragma: no cover - parse-defensive
                     return json.loads(text) if text else {}
 
@@ -1166,7 +1278,7 @@ class OpenCodeServerManager:
             try:
                 async with session.get(f"{self.base_url}/provider/auth") as resp:
                     if resp.status == 200:
-                        return await resp.json()
+                        return await resp.json(loads=_decode_json)
                     return {}
             except Exception as e:
                 logger.warning(f"Failed to get OpenCode provider/auth: {e}")
@@ -1197,14 +1309,13 @@ class OpenCodeServerManager:
         )
 
     async def _get_global_config_snapshot(self) -> Optional[Dict[str, Any]]:
-        total_timeout: Optional[int] = None if self.request_timeout_seconds <= 0 else self.request_timeout_seconds
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=total_timeout)) as session:
-            async with session.get(f"{self.base_url}/global/config") as resp:
-                if resp.status != 200:
-                    await resp.read()
-                    return None
-                data = await resp.json()
-                return data if isinstance(data, dict) else None
+        session = await self._get_http_session()
+        async with session.get(f"{self.base_url}/global/config") as resp:
+            if resp.status != 200:
+                await resp.read()
+                return None
+            data = await resp.json(loads=_decode_json)
+            return data if isinstance(data, dict) else None
 
     def _get_agent_config(self, config: Dict[str, Any], agent_name: Optional[str]) -> Dict[str, Any]:
         """Get agent-specific config from opencode.json with type safety."""
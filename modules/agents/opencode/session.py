@@ -10,11 +10,14 @@ import asyncio
 import logging
 import os
 import time
-from typing import Dict, Optional, Tuple
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional
 
 from modules.agents.base import AgentRequest, BaseAgent
 
 from .server import OpenCodeServerManager
+from .types import RequestSessionInfo
 
 
 class OpenCodeResumeUnavailableError(RuntimeError):
@@ -33,7 +36,24 @@ class OpenCodeResumeUnavailableError(RuntimeError):
 logger = logging.getLogger(__name__)
 
 
-RequestSessionTuple = Tuple[str, str, str]
+# Upper bound on remembered "initialized" OpenCode sessions. The set only
+# suppresses a repeated init marker, so forgetting a long-idle session is
+# harmless, while an unbounded set grows for the whole process lifetime.
+_INITIALIZED_SESSIONS_MAX = 4096
+
+# A mapped session the server confirmed (or accepted a prompt for) this
+# recently is assumed to still exist, so follow-up messages skip the
+# GET /session/{id} round-trip. A failed prompt drops the entry again.
+_SESSION_VERIFY_TTL_SECONDS = 60.0
+
+# Upper bound on remembered working directories that already exist. A miss
+# only costs one extra makedirs call, so a small LRU is enough.
+_CREATED_WORKING_DIRS_MAX = 1024
+
+# After an abort the server usually settles within milliseconds, so idle
+# polling starts short and backs off instead of sleeping a full second.
+_IDLE_POLL_INITIAL_DELAY = 0.05
+_IDLE_POLL_MAX_DELAY = 1.0
 
 
 class OpenCodeSessionManager:
@@ -43,11 +63,23 @@ class OpenCodeSessionManager:
         self._settings_manager = settings_manager
         self._agent_name = agent_name
 
-        self._request_sessions: Dict[str, RequestSessionTuple] = {}
-        self._session_locks: Dict[str, asyncio.Lock] = {}
-        self._initialized_sessions: set[str] = set()
-
-    def get_request_session(self, base_session_id: str) -> Optional[RequestSessionTuple]:
+        self._request_sessions: Dict[str, RequestSessionInfo] = {}
+        # handle_message keeps its lock referenced for the whole turn, so a
+        # weak map drops locks for threads that have gone quiet.
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._initialized_sessions: OrderedDict[str, None] = OrderedDict()
+        # session_id -> monotonic time of the last successful server lookup,
+        # oldest first so expired entries can be trimmed from the front.
+        self._verified_sessions: OrderedDict[str, float] = OrderedDict()
+        self._created_working_dirs: OrderedDict[str, None] = OrderedDict()
+        # Sessions created by get_or_create_session_id that have not been
+        # prompted yet; they have no message history to snapshot.
+        self._fresh_sessions: set[str] = set()
+        # Sessions handed out on the verify-TTL hit path, i.e. without a server
+        # lookup this turn; a failing prompt re-checks them once.
+        self._unchecked_sessions: set[str] = set()
+
+    def get_request_session(self, base_session_id: str) -> Optional[RequestSessionInfo]:
         return self._request_sessions.get(base_session_id)
 
     def set_request_session(
@@ -57,19 +89,19 @@ class OpenCodeSessionManager:
         working_path: str,
         session_key: str,
     ) -> None:
-        self._request_sessions[base_session_id] = (
-            opencode_session_id,
-            working_path,
-            session_key,
+        self._request_sessions[base_session_id] = RequestSessionInfo(
+            opencode_session_id=opencode_session_id,
+            working_path=working_path,
+            session_key=session_key,
         )
 
-    def pop_request_session(self, base_session_id: str) -> Optional[RequestSessionTuple]:
+    def pop_request_session(self, base_session_id: str) -> Optional[RequestSessionInfo]:
         return self._request_sessions.pop(base_session_id, None)
 
-    def pop_all_for_session_key(self, session_key: str) -> Dict[str, RequestSessionTuple]:
-        matches: Dict[str, RequestSessionTuple] = {}
+    def pop_all_for_session_key(self, session_key: str) -> Dict[str, RequestSessionInfo]:
+        matches: Dict[str, RequestSessionInfo] = {}
         for base_id, info in list(self._request_sessions.items()):
-            if len(info) >= 3 and info[2] == session_key:
+            if info.session_key == session_key:
                 matches[base_id] = info
         return matches
 
@@ -167,14 +199,52 @@ class OpenCodeSessionManager:
         """Return True if this session was newly marked initialized."""
 
         if opencode_session_id in self._initialized_sessions:
+            self._initialized_sessions.move_to_end(opencode_session_id)
             return False
-        self._initialized_sessions.add(opencode_session_id)
+        self._initialized_sessions[opencode_session_id] = None
+        if len(self._initialized_sessions) > _INITIALIZED_SESSIONS_MAX:
+            self._initialized_sessions.popitem(last=False)
         return True
 
+    def pop_fresh_session(self, opencode_session_id: str) -> bool:
+        """Return True once for a session this manager just created."""
+
+        if opencode_session_id in self._fresh_sessions:
+            self._fresh_sessions.discard(opencode_session_id)
+            return True
+        return False
+
+    def pop_unchecked_session(self, opencode_session_id: str) -> bool:
+        """Return True once for a session reused without a server lookup."""
+
+        if opencode_session_id in self._unchecked_sessions:
+            self._unchecked_sessions.discard(opencode_session_id)
+            return True
+        return False
+
+    def _is_recently_verified(self, opencode_session_id: str) -> bool:
+        verified_at = self._verified_sessions.get(opencode_session_id)
+        return verified_at is not None and time.monotonic() - verified_at < _SESSION_VERIFY_TTL_SECONDS
+
+    def mark_verified(self, opencode_session_id: str) -> None:
+        now = time.monotonic()
+        self._verified_sessions[opencode_session_id] = now
+        self._verified_sessions.move_to_end(opencode_session_id)
+        while self._verified_sessions:
+            oldest_id, verified_at = next(iter(self._verified_sessions.items()))
+            if now - verified_at < _SESSION_VERIFY_TTL_SECONDS:
+                break
+            del self._verified_sessions[oldest_id]
+
+    def forget_verified(self, opencode_session_id: str) -> None:
+        self._verified_sessions.pop(opencode_session_id, None)
+
     def get_session_lock(self, base_session_id: str) -> asyncio.Lock:
-        if base_session_id not in self._session_locks:
-            self._session_locks[base_session_id] = asyncio.Lock()
-        return self._session_locks[base_session_id]
+        lock = self._session_locks.get(base_session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[base_session_id] = lock
+        return lock
 
     async def wait_for_session_idle(
         self,
@@ -184,12 +254,13 @@ class OpenCodeSessionManager:
         timeout_seconds: float = 15.0,
     ) -> None:
         deadline = time.monotonic() + timeout_seconds
+        delay = _IDLE_POLL_INITIAL_DELAY
         while time.monotonic() < deadline:
             try:
                 messages = await server.list_messages(session_id, directory)
             except Exception as err:
                 logger.debug(f"Failed to poll OpenCode session {session_id} for idle: {err}")
-                await asyncio.sleep(1.0)
+                await asyncio.sleep(_IDLE_POLL_MAX_DELAY)
                 continue
 
             in_progress = False
@@ -205,7 +276,8 @@ class OpenCodeSessionManager:
             if not in_progress:
                 return
 
-            await asyncio.sleep(1.0)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _IDLE_POLL_MAX_DELAY)
 
         logger.warning(
             "OpenCode session %s did not reach idle state within %.1fs",
@@ -214,8 +286,16 @@ class OpenCodeSessionManager:
         )
 
     async def ensure_working_dir(self, working_path: str) -> None:
-        if not os.path.exists(working_path):
-            os.makedirs(working_path, exist_ok=True)
+        # exist_ok covers the "already there" case, so one makedirs call replaces
+        # the exists()+makedirs() pair. Run it off the event loop: on slow or
+        # network mounts the stat alone can stall every other session.
+        if working_path in self._created_working_dirs:
+            self._created_working_dirs.move_to_end(working_path)
+            return
+        await asyncio.to_thread(os.makedirs, working_path, exist_ok=True)
+        self._created_working_dirs[working_path] = None
+        if len(self._created_working_dirs) > _CREATED_WORKING_DIRS_MAX:
+            self._created_working_dirs.popitem(last=False)
 
     async def get_or_create_session_id(self, request: AgentRequest, server: OpenCodeServerManager) -> Optional[str]:
         """Get a cached OpenCode session id, or create a new session.
@@ -254,6 +334,8 @@ class OpenCodeSessionManager:
                 )
                 session_id = session_data.get("id")
                 if session_id:
+                    self.mark_verified(session_id)
+                    self._fresh_sessions.add(session_id)
                     self.bind_agent_session_id(request, anchor, session_id)
                     logger.info(f"Created OpenCode session {session_id} for {request.base_session_id}")
             except Exception as e:
@@ -261,12 +343,19 @@ class OpenCodeSessionManager:
                 return None
             return session_id
 
+        if self._is_recently_verified(session_id):
+            self._unchecked_sessions.add(session_id)
+            self.bind_agent_session_id(request, anchor, session_id)
+            return session_id
+
         # raise_on_error=True so a transport/connection failure propagates as a
         # transient server error (handled by the normal error path) rather than
         # being mislabeled as expiry — only a genuine "not found" (None) is
         # treated as context loss below.
         existing = await server.get_session(session_id, request.working_path, raise_on_error=True)
         if existing:
+            self._unchecked_sessions.discard(session_id)
+            self.mark_verified(session_id)
             self.bind_agent_session_id(request, anchor, session_id)
             return session_id
 
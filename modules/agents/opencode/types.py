@@ -11,7 +11,7 @@ class ModelDict(TypedDict):
     modelID: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RequestSessionInfo:
     opencode_session_id: str
     working_path: str
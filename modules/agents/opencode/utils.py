@@ -44,14 +44,18 @@ def _parse_provider_id(model_key: Optional[str]) -> Optional[str]:
     return provider_id or None
 
 
+def _provider_id(provider: dict) -> str:
+    get = provider.get
+    return get("id") or get("provider_id") or get("name") or ""
+
+
 def _find_model_variants(opencode_models: dict, target_model: Optional[str]) -> Dict[str, Any]:
     target_provider, target_model_id = _parse_model_key(target_model)
     if not target_provider or not target_model_id or not isinstance(opencode_models, dict):
         return {}
     providers_data = opencode_models.get("providers", [])
     for provider in providers_data:
-        provider_id = provider.get("id") or provider.get("provider_id") or provider.get("name")
-        if provider_id != target_provider:
+        if _provider_id(provider) != target_provider:
             continue
 
         models = provider.get("models", {})
@@ -210,18 +214,14 @@ def build_opencode_model_option_items(
     providers_data = opencode_models.get("providers", [])
     defaults = opencode_models.get("default", {})
 
+    allowed_set = {p for p in allowed_providers or () if isinstance(p, str) and p}
     providers: List[Tuple[str, dict]] = []
     for provider in providers_data:
-        provider_id = provider.get("id") or provider.get("provider_id") or provider.get("name") or ""
-        if not provider_id:
+        provider_id = _provider_id(provider)
+        if not provider_id or (allowed_set and provider_id not in allowed_set):
             continue
         providers.append((provider_id, provider))
 
-    if allowed_providers:
-        allowed_set = {p for p in allowed_providers if isinstance(p, str) and p}
-        if allowed_set:
-            providers = [entry for entry in providers if entry[0] in allowed_set]
-
     if preferred_providers:
         preferred_set = {p for p in preferred_providers if isinstance(p, str) and p}
         if preferred_set:
@@ -241,8 +241,11 @@ def build_opencode_model_option_items(
 
     options: List[Dict[str, str]] = []
     for provider_id, provider in providers:
-        provider_name = provider.get("name") or provider_id
-        models = provider.get("models", {})
+        if len(options) >= max_total:
+            break
+        provider_get = provider.get
+        provider_name = provider_get("name") or provider_id
+        models = provider_get("models", {})
 
         if isinstance(models, dict):
             model_items = list(models.items())
@@ -256,7 +259,7 @@ def build_opencode_model_option_items(
         model_items.sort(key=_model_sort_key)
         provider_model_count = 0
         for model_id, model_info in model_items:
-            if provider_model_count >= max_per_provider:
+            if provider_model_count >= max_per_provider or len(options) >= max_total:
                 break
             if not model_id:
                 continue
@@ -275,8 +278,6 @@ def build_opencode_model_option_items(
             options.append({"label": display, "value": full_model})
             provider_model_count += 1
 
-    if len(options) > max_total:
-        options = options[:max_total]
     return options
 
 
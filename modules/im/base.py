@@ -30,7 +30,7 @@ class FileDownloadResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageContext:
     """Platform-agnostic message context"""
 
@@ -195,6 +195,9 @@ class BaseIMClient(ABC):
         stripped = text.strip()
         if not stripped:
             return None
+        # Most messages are plain chat: reject them before splitting.
+        if stripped[0] != "/" and not (allow_plain_bind and stripped.startswith("bind")):
+            return None
 
         parts = stripped.split(maxsplit=1)
         head = parts[0]
@@ -1,9 +1,13 @@
 import asyncio
+import functools
 import io
+import itertools
 import json
 import logging
 import os
+import re
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Callable, List
 
 import aiohttp
@@ -36,6 +40,61 @@ from vibe.claude_model_catalog import DEFAULT_CLAUDE_MODEL_ALIASES
 
 logger = logging.getLogger(__name__)
 
+# Attachment downloads share one pooled session so repeated CDN fetches reuse
+# warm keep-alive connections and cached DNS instead of a fresh handshake.
+DOWNLOAD_POOL_LIMIT = 32
+DOWNLOAD_DNS_CACHE_TTL = 300
+DOWNLOAD_KEEPALIVE_TIMEOUT = 75
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# Channels/threads the gateway cache does not hold (archived threads, DMs)
+# cost a REST call per lookup; remember fetched ones briefly.
+FETCHED_CHANNEL_CACHE_MAX = 512
+FETCHED_CHANNEL_CACHE_TTL_SECONDS = 300.0
+USER_INFO_CACHE_MAX = 1024
+USER_INFO_CACHE_TTL_SECONDS = 300.0
+# Active threads expire after a day; refreshing the stored timestamp more
+# than once a minute per thread only adds a database write to every send.
+THREAD_ACTIVE_REFRESH_SECONDS = 60.0
+THREAD_ACTIVE_REFRESH_MAX = 1024
+# Modal views are posted via follow-ups after the ACK; cap concurrent posts so a
+# burst of opens does not crowd other REST calls off the shared HTTP session.
+MODAL_SEND_CONCURRENCY = 8
+_EYES_ALIASES = frozenset({":eyes:", "eyes", "eye", "👀"})
+# Select values that mean "use the backend default".
+_DEFAULT_SENTINELS = frozenset({None, "__default__"})
+# RoutingSettings fields the routing picker reads.
+_ROUTING_FIELDS = (
+    "agent_backend",
+    "model",
+    "reasoning_effort",
+    "opencode_agent",
+    "opencode_model",
+    "opencode_reasoning_effort",
+    "claude_agent",
+    "claude_model",
+    "claude_reasoning_effort",
+    "codex_agent",
+    "codex_model",
+    "codex_reasoning_effort",
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _select_options(
+    choices: tuple[tuple[str, str], ...], selected: Optional[str | frozenset[str]] = None
+) -> tuple[discord.SelectOption, ...]:
+    """Build (and memoize) select options from ``(label, value)`` pairs.
+
+    Views only serialize their options, so one tuple is shared between every
+    menu opened with the same choices; wrap it in ``list()`` for ``Select``.
+    Pass a frozenset as ``selected`` to preselect several values.
+    """
+    if isinstance(selected, frozenset):
+        return tuple(
+            discord.SelectOption(label=label, value=value, default=value in selected) for label, value in choices
+        )
+    return tuple(discord.SelectOption(label=label, value=value, default=value == selected) for label, value in choices)
+
 
 def _prioritize_claude_model_choices(models: List[str], current_model: Optional[str]) -> List[str]:
     """Order Claude model ids so the active selection and the canonical bare
@@ -48,8 +107,9 @@ def _prioritize_claude_model_choices(models: List[str], current_model: Optional[
     """
     priority: List[str] = []
     seen: set[str] = set()
+    available = set(models)
     for candidate in (current_model, *DEFAULT_CLAUDE_MODEL_ALIASES):
-        if candidate and candidate in models and candidate not in seen:
+        if candidate and candidate in available and candidate not in seen:
             priority.append(candidate)
             seen.add(candidate)
     return priority + [model for model in models if model not in seen]
@@ -71,18 +131,29 @@ class DiscordBot(BaseIMClient):
 
         self.client = discord.Client(intents=intents)
         self.formatter = DiscordFormatter()
+        self.reload_allowlists()
 
         self.settings_manager = None
         self.sessions = None
         self._controller = None
+        self._lang_fn: Optional[Callable[[], str]] = None
         self._on_ready: Optional[Callable] = None
-        self._user_info_cache: Dict[str, Dict[str, Any]] = {}
+        self._user_info_cache: OrderedDict[str, tuple[float, Dict[str, Any]]] = OrderedDict()
         self._recent_interaction_ids: Dict[str, float] = {}
         self._recent_callback_keys: Dict[str, float] = {}
         self._callback_dedupe_ttl_seconds = 3.0
+        self._auth_denial_sent_at: Dict[str, float] = {}
+        self._auth_denial_dedupe_ttl_seconds = 30.0
+        self._mention_re: Optional[re.Pattern[str]] = None
+        self._fetched_channels: OrderedDict[int, tuple[float, discord.abc.Messageable]] = OrderedDict()
+        self._thread_marked_at: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self._modal_send_semaphore = asyncio.Semaphore(MODAL_SEND_CONCURRENCY)
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._http_session_loop: Optional[asyncio.AbstractEventLoop] = None
 
         self.client.on_ready = self._on_ready_event
         self.client.on_message = self._on_message_event
+        self.client.on_user_update = self._on_user_update_event
 
     def set_settings_manager(self, settings_manager):
         self.settings_manager = settings_manager
@@ -90,6 +161,12 @@ class DiscordBot(BaseIMClient):
 
     def set_controller(self, controller):
         self._controller = controller
+        self._lang_fn = None
+        if controller is not None and hasattr(controller, "config"):
+            if hasattr(controller, "_get_lang"):
+                self._lang_fn = controller._get_lang
+            else:
+                self._lang_fn = lambda: getattr(controller.config, "language", "en")
 
     def register_callbacks(
         self,
@@ -111,11 +188,7 @@ class DiscordBot(BaseIMClient):
             self._on_ready = kwargs["on_ready"]
 
     def _get_lang(self, channel_id: Optional[str] = None) -> str:
-        if self._controller and hasattr(self._controller, "config"):
-            if hasattr(self._controller, "_get_lang"):
-                return self._controller._get_lang()
-            return getattr(self._controller.config, "language", "en")
-        return "en"
+        return self._lang_fn() if self._lang_fn else "en"
 
     def _t(self, key: str, channel_id: Optional[str] = None, **kwargs) -> str:
         lang = self._get_lang(channel_id)
@@ -368,11 +441,35 @@ class DiscordBot(BaseIMClient):
         current_loop = asyncio.get_running_loop()
         if loop is None or loop is current_loop:
             await self.client.close()
+        if self._http_session is not None and self._http_session_loop is current_loop:
+            await self._http_session.close()
+            self._http_session = None
+            self._http_session_loop = None
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        current_loop = asyncio.get_running_loop()
+        # Recreate the session if it's closed or bound to a different event loop
+        if self._http_session is None or self._http_session.closed or self._http_session_loop is not current_loop:
+            if self._http_session is not None and not self._http_session.closed:
+                try:
+                    await self._http_session.close()
+                except Exception:
+                    pass
+            connector = aiohttp.TCPConnector(
+                limit=DOWNLOAD_POOL_LIMIT,
+                ttl_dns_cache=DOWNLOAD_DNS_CACHE_TTL,
+                keepalive_timeout=DOWNLOAD_KEEPALIVE_TIMEOUT,
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+            self._http_session_loop = current_loop
+        return self._http_session
 
     # ---------------------------------------------------------------------
     # Message helpers
     # ---------------------------------------------------------------------
-    def _to_int_id(self, value: Optional[str]) -> Optional[int]:
+    def _to_int_id(self, value: Optional[str | int]) -> Optional[int]:
+        if type(value) is int:
+            return value
         if not value:
             return None
         try:
@@ -380,18 +477,36 @@ class DiscordBot(BaseIMClient):
         except (TypeError, ValueError):
             return None
 
-    async def _fetch_channel(self, channel_id: Optional[str]) -> Optional[discord.abc.Messageable]:
+    def _cached_channel(self, cid: int) -> Optional[discord.abc.Messageable]:
+        """Return the channel from the gateway or fetched-channel cache without any IO."""
+        channel = self.client.get_channel(cid)
+        if channel is not None:
+            return channel
+        cached = self._fetched_channels.get(cid)
+        if cached is not None:
+            fetched_at, channel = cached
+            if time.monotonic() - fetched_at < FETCHED_CHANNEL_CACHE_TTL_SECONDS:
+                self._fetched_channels.move_to_end(cid)
+                return channel
+            del self._fetched_channels[cid]
+        return None
+
+    async def _fetch_channel(self, channel_id: Optional[str | int]) -> Optional[discord.abc.Messageable]:
         cid = self._to_int_id(channel_id)
         if cid is None:
             return None
-        channel = self.client.get_channel(cid)
+        channel = self._cached_channel(cid)
         if channel is not None:
             return channel
         try:
-            return await self.client.fetch_channel(cid)
+            channel = await self.client.fetch_channel(cid)
         except Exception as err:
             logger.debug("Failed to fetch channel %s: %s", channel_id, err)
             return None
+        self._fetched_channels[cid] = (time.monotonic(), channel)
+        if len(self._fetched_channels) > FETCHED_CHANNEL_CACHE_MAX:
+            self._fetched_channels.popitem(last=False)
+        return channel
 
     def _get_context_channel(self, context: MessageContext):
         payload = context.platform_specific or {}
@@ -408,6 +523,21 @@ class DiscordBot(BaseIMClient):
         if isinstance(direct_channel, discord.Thread):
             return direct_channel
 
+        if context.thread_id and direct_channel is None:
+            thread_cid = self._to_int_id(context.thread_id)
+            cached = self._cached_channel(thread_cid) if thread_cid is not None else None
+            if isinstance(cached, discord.Thread):
+                return cached
+            # Look both up at once so a missing thread does not serialize a
+            # second REST round-trip for the parent channel.
+            target, channel = await asyncio.gather(
+                self._fetch_channel(context.thread_id),
+                self._fetch_channel(context.channel_id),
+            )
+            if isinstance(target, discord.Thread):
+                return target
+            return channel
+
         if context.thread_id:
             target = await self._fetch_channel(context.thread_id)
             if isinstance(target, discord.Thread):
@@ -418,15 +548,35 @@ class DiscordBot(BaseIMClient):
 
         return await self._fetch_channel(context.channel_id)
 
+    def _get_context_message(self, context: MessageContext, message_id: str) -> Optional[discord.Message]:
+        payload = context.platform_specific or {}
+        message = payload.get("message") if isinstance(payload, dict) else None
+        if message is not None and str(getattr(message, "id", "")) == str(message_id):
+            return message
+        return None
+
+    async def _message_ref(self, target: discord.abc.Messageable, message_id: str):
+        # A partial message issues edits/reactions directly, without the GET
+        # that fetch_message would spend just to obtain the object.
+        get_partial = getattr(target, "get_partial_message", None)
+        if get_partial is not None:
+            return get_partial(int(message_id))
+        return await target.fetch_message(int(message_id))
+
     def _extract_context_ids(self, channel: discord.abc.GuildChannel | discord.Thread) -> tuple[str, Optional[str]]:
+        channel_id = str(channel.id)
         if isinstance(channel, discord.Thread):
-            parent_id = str(channel.parent_id) if channel.parent_id else str(channel.id)
-            return parent_id, str(channel.id)
-        return str(channel.id), None
+            return (str(channel.parent_id) if channel.parent_id else channel_id), channel_id
+        return channel_id, None
 
     def _clean_message_text(self, text: str) -> str:
         return (text or "").strip()
 
+    def reload_allowlists(self) -> None:
+        """Rebuild the guild allow/deny sets from ``self.config``."""
+        self._guild_allow = frozenset(self.config.guild_allowlist or ())
+        self._guild_deny = frozenset(self.config.guild_denylist or ())
+
     def _is_allowed_guild(self, guild_id: Optional[str]) -> bool:
         if guild_id and self.settings_manager and hasattr(self.settings_manager, "has_guild_scope"):
             try:
@@ -438,10 +588,9 @@ class DiscordBot(BaseIMClient):
             except Exception:
                 logger.debug("Failed to resolve Discord guild access settings", exc_info=True)
 
-        allow = set(self.config.guild_allowlist or [])
-        deny = set(self.config.guild_denylist or [])
-        if guild_id and guild_id in deny:
+        if guild_id and guild_id in self._guild_deny:
             return False
+        allow = self._guild_allow
         if allow and (not guild_id or guild_id not in allow):
             return False
         return True
@@ -491,17 +640,65 @@ class DiscordBot(BaseIMClient):
             target = await self._resolve_target(context)
             if target is None:
                 raise RuntimeError("Discord channel not found")
-            message = await target.send(content=text)
-            if self.settings_manager and context.thread_id:
-                try:
-                    if self.sessions:
-                        self.sessions.mark_thread_active(context.user_id, context.channel_id, context.thread_id)
-                except Exception:
-                    pass
+            try:
+                message = await target.send(content=text)
+            except (discord.NotFound, discord.Forbidden):
+                self._fetched_channels.pop(getattr(target, "id", None), None)
+                raise
+            self._mark_thread_active(context)
             return str(message.id)
 
         return await self._run_on_client_loop(_impl())
 
+    def _mark_thread_active(self, context: MessageContext) -> None:
+        if not (self.settings_manager and self.sessions and context.thread_id):
+            return
+        key = (str(context.user_id), str(context.channel_id), str(context.thread_id))
+        now = time.monotonic()
+        marked_at = self._thread_marked_at.get(key)
+        if marked_at is not None and now - marked_at < THREAD_ACTIVE_REFRESH_SECONDS:
+            return
+        try:
+            self.sessions.mark_thread_active(context.user_id, context.channel_id, context.thread_id)
+        except Exception:
+            return
+        self._thread_marked_at[key] = now
+        self._thread_marked_at.move_to_end(key)
+        if len(self._thread_marked_at) > THREAD_ACTIVE_REFRESH_MAX:
+            self._thread_marked_at.popitem(last=False)
+
+    async def send_many(self, context: MessageContext, texts: List[str]) -> List[str]:
+        """Send ``texts`` in order to one target, resolving it only once.
+
+        Sends stay sequential so chunks keep their order in the channel.
+        Stops at the first failure and returns the ids sent so far.
+        """
+
+        async def _impl() -> List[str]:
+            message_ids: List[str] = []
+            target = await self._resolve_target(context)
+            if target is None:
+                logger.error("Failed to send Discord messages: channel not found")
+                return message_ids
+            for text in texts:
+                if not text:
+                    continue
+                try:
+                    message = await target.send(content=text)
+                except (discord.NotFound, discord.Forbidden) as err:
+                    self._fetched_channels.pop(getattr(target, "id", None), None)
+                    logger.error("Failed to send Discord message: %s", err, exc_info=True)
+                    break
+                except Exception as err:
+                    logger.error("Failed to send Discord message: %s", err, exc_info=True)
+                    break
+                message_ids.append(str(message.id))
+            if message_ids:
+                self._mark_thread_active(context)
+            return message_ids
+
+        return await self._run_on_client_loop(_impl())
+
     async def send_message_with_buttons(
         self,
         context: MessageContext,
@@ -519,13 +716,12 @@ class DiscordBot(BaseIMClient):
                 if _PersistentStartView.is_all_static(keyboard)
                 else _DiscordButtonView(self, context, keyboard)
             )
-            message = await target.send(content=text, view=view)
-            if self.settings_manager and context.thread_id:
-                try:
-                    if self.sessions:
-                        self.sessions.mark_thread_active(context.user_id, context.channel_id, context.thread_id)
-                except Exception:
-                    pass
+            try:
+                message = await target.send(content=text, view=view)
+            except (discord.NotFound, discord.Forbidden):
+                self._fetched_channels.pop(getattr(target, "id", None), None)
+                raise
+            self._mark_thread_active(context)
             return str(message.id)
 
         return await self._run_on_client_loop(_impl())
@@ -543,7 +739,7 @@ class DiscordBot(BaseIMClient):
             if target is None:
                 return False
             try:
-                msg = await target.fetch_message(int(message_id))
+                msg = await self._message_ref(target, message_id)
                 view = None
                 if keyboard:
                     view = (
@@ -589,14 +785,16 @@ class DiscordBot(BaseIMClient):
 
     async def add_reaction(self, context: MessageContext, message_id: str, emoji: str) -> bool:
         async def _impl() -> bool:
-            target = await self._resolve_target(context)
-            if target is None:
-                return False
+            msg = self._get_context_message(context, message_id)
+            target = None
+            if msg is None:
+                target = await self._resolve_target(context)
+                if target is None:
+                    return False
             try:
-                msg = await target.fetch_message(int(message_id))
-                normalized = emoji
-                if normalized in [":eyes:", "eyes", "eye", "👀"]:
-                    normalized = "👀"
+                if msg is None:
+                    msg = await self._message_ref(target, message_id)
+                normalized = "👀" if emoji in _EYES_ALIASES else emoji
                 await msg.add_reaction(normalized)
                 return True
             except Exception as err:
@@ -607,14 +805,16 @@ class DiscordBot(BaseIMClient):
 
     async def remove_reaction(self, context: MessageContext, message_id: str, emoji: str) -> bool:
         async def _impl() -> bool:
-            target = await self._resolve_target(context)
-            if target is None:
-                return False
+            msg = self._get_context_message(context, message_id)
+            target = None
+            if msg is None:
+                target = await self._resolve_target(context)
+                if target is None:
+                    return False
             try:
-                msg = await target.fetch_message(int(message_id))
-                normalized = emoji
-                if normalized in [":eyes:", "eyes", "eye", "👀"]:
-                    normalized = "👀"
+                if msg is None:
+                    msg = await self._message_ref(target, message_id)
+                normalized = "👀" if emoji in _EYES_ALIASES else emoji
                 await msg.remove_reaction(normalized, self.client.user)
                 return True
             except Exception as err:
@@ -627,14 +827,16 @@ class DiscordBot(BaseIMClient):
         self,
         context: MessageContext,
         title: str,
-        content: str,
+        content: str | bytes,
         filetype: str = "markdown",
     ) -> str:
         async def _impl() -> str:
             target = await self._resolve_target(context)
             if target is None:
                 raise RuntimeError("Discord channel not found")
-            data = (content or "").encode("utf-8")
+            # BytesIO shares an initial bytes buffer, so pre-encoded content is
+            # uploaded without another copy.
+            data = content if isinstance(content, bytes) else (content or "").encode("utf-8")
             file_obj = discord.File(io.BytesIO(data), filename=title)
             message = await target.send(file=file_obj)
             return str(message.id)
@@ -691,27 +893,40 @@ class DiscordBot(BaseIMClient):
         file_info: Dict[str, Any],
         max_bytes: Optional[int] = None,
         timeout_seconds: int = 30,
-    ) -> Optional[bytes]:
+    ) -> Optional[bytes | bytearray]:
         url = file_info.get("url") or file_info.get("url_private_download") or file_info.get("url_private")
         if not url:
             return None
         try:
+            session = await self._get_http_session()
             timeout = aiohttp.ClientTimeout(total=timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
+            async with session.get(url, timeout=timeout) as response:
+                if response.status != 200:
+                    return None
+                # Fill one buffer sized from Content-Length instead of keeping
+                # every chunk alive until a final join. The header is only a
+                # hint (a decoded body may differ), so trim to what arrived, and
+                # only trust it up front when max_bytes bounds the allocation.
+                expected_size = 0
+                if max_bytes is not None:
+                    try:
+                        expected_size = max(int(response.headers.get("Content-Length") or 0), 0)
+                    except ValueError:
+                        expected_size = 0
+                    if expected_size > max_bytes:
                         return None
-                    content_length = response.headers.get("Content-Length")
-                    if max_bytes is not None and content_length and int(content_length) > max_bytes:
+                buffer = bytearray(expected_size)
+                total_size = 0
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    end = total_size + len(chunk)
+                    if max_bytes is not None and end > max_bytes:
                         return None
-                    chunks = []
-                    total_size = 0
-                    async for chunk in response.content.iter_chunked(64 * 1024):
-                        total_size += len(chunk)
-                        if max_bytes is not None and total_size > max_bytes:
-                            return None
-                        chunks.append(chunk)
-                    return b"".join(chunks)
+                    buffer[total_size:end] = chunk
+                    total_size = end
+                del buffer[total_size:]
+                # Hand back the buffer itself: bytes(buffer) would copy the whole
+                # body again. Callers only write, slice and measure it.
+                return buffer
         except Exception as err:
             logger.debug("Failed to download Discord file: %s", err)
             return None
@@ -727,25 +942,23 @@ class DiscordBot(BaseIMClient):
         if not url:
             return FileDownloadResult(False, "No download URL available")
         try:
+            session = await self._get_http_session()
             timeout = aiohttp.ClientTimeout(total=timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return FileDownloadResult(False, f"Download failed with HTTP {response.status}")
-                    content_length = response.headers.get("Content-Length")
-                    if max_bytes is not None and content_length and int(content_length) > max_bytes:
-                        return FileDownloadResult(False, f"File exceeds the allowed size limit ({max_bytes} bytes)")
-
-                    total_size = 0
-                    with open(target_path, "wb") as file_obj:
-                        async for chunk in response.content.iter_chunked(64 * 1024):
-                            total_size += len(chunk)
-                            if max_bytes is not None and total_size > max_bytes:
-                                return FileDownloadResult(
-                                    False, f"File exceeds the allowed size limit ({max_bytes} bytes)"
-                                )
-                            file_obj.write(chunk)
-                    return FileDownloadResult(True)
+            async with session.get(url, timeout=timeout) as response:
+                if response.status != 200:
+                    return FileDownloadResult(False, f"Download failed with HTTP {response.status}")
+                content_length = response.headers.get("Content-Length")
+                if max_bytes is not None and content_length and int(content_length) > max_bytes:
+                    return FileDownloadResult(False, f"File exceeds the allowed size limit ({max_bytes} bytes)")
+
+                total_size = 0
+                with open(target_path, "wb") as file_obj:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        total_size += len(chunk)
+                        if max_bytes is not None and total_size > max_bytes:
+                            return FileDownloadResult(False, f"File exceeds the allowed size limit ({max_bytes} bytes)")
+                        file_obj.write(chunk)
+                return FileDownloadResult(True)
         except Exception as err:
             logger.debug("Failed to download Discord file to path: %s", err)
             return FileDownloadResult(False, f"Download error: {err}")
@@ -753,7 +966,11 @@ class DiscordBot(BaseIMClient):
     async def get_user_info(self, user_id: str) -> Dict[str, Any]:
         cached = self._user_info_cache.get(user_id)
         if cached is not None:
-            return cached
+            cached_at, info = cached
+            if time.monotonic() - cached_at < USER_INFO_CACHE_TTL_SECONDS:
+                self._user_info_cache.move_to_end(user_id)
+                return info
+            self._user_info_cache.pop(user_id, None)
 
         async def _impl() -> Dict[str, Any]:
             uid = self._to_int_id(user_id)
@@ -768,7 +985,9 @@ class DiscordBot(BaseIMClient):
             if user is None:
                 return {"id": user_id}
             info = {"id": str(user.id), "name": user.name, "display_name": user.display_name}
-            self._user_info_cache[user_id] = info
+            self._user_info_cache[user_id] = (time.monotonic(), info)
+            if len(self._user_info_cache) > USER_INFO_CACHE_MAX:
+                self._user_info_cache.popitem(last=False)
             return info
 
         return await self._run_on_client_loop(_impl())
@@ -786,8 +1005,21 @@ class DiscordBot(BaseIMClient):
     # ---------------------------------------------------------------------
     # Discord-specific interaction helpers
     # ---------------------------------------------------------------------
+    def _get_mention_re(self) -> Optional[re.Pattern[str]]:
+        """Return the bot-mention pattern, compiling it on first use.
+
+        on_message can be dispatched before on_ready (guild chunking,
+        reconnects), so the pattern is built from ``client.user`` on demand.
+        """
+        if self._mention_re is None:
+            user = getattr(self.client, "user", None)
+            if user is not None:
+                self._mention_re = re.compile(rf"<@!?{user.id}>")
+        return self._mention_re
+
     async def _on_ready_event(self):
         logger.info("Discord client ready")
+        self._get_mention_re()
         # Register persistent view so /start menu buttons survive restarts.
         try:
             self.client.add_view(_PersistentStartView(self))
@@ -799,6 +1031,9 @@ class DiscordBot(BaseIMClient):
             except Exception as err:
                 logger.error("Discord on_ready callback failed: %s", err, exc_info=True)
 
+    async def _on_user_update_event(self, before: discord.User, after: discord.User):
+        self._user_info_cache.pop(str(after.id), None)
+
     async def _is_authorized_channel(self, channel_id: str) -> bool:
         if not self.settings_manager:
             logger.warning("No settings_manager configured; rejecting by default")
@@ -834,6 +1069,18 @@ class DiscordBot(BaseIMClient):
                 logger.debug("Failed to send interaction auth denial: %s", err)
             return
 
+        # Repeated denials for one user in one channel (e.g. a busy channel that
+        # is not enabled) post the notice once per window instead of per
+        # message; another user in the same channel still gets their own.
+        now = time.monotonic()
+        cutoff = now - self._auth_denial_dedupe_ttl_seconds
+        denial_key = f"{channel_id}:{user_id}:{msg}"
+        last_sent = self._auth_denial_sent_at.get(denial_key)
+        if last_sent is not None and last_sent >= cutoff:
+            return
+        self._auth_denial_sent_at = {key: ts for key, ts in self._auth_denial_sent_at.items() if ts >= cutoff}
+        self._auth_denial_sent_at[denial_key] = now
+
         channel = await self._fetch_channel(channel_id)
         if channel is None:
             return
@@ -842,6 +1089,32 @@ class DiscordBot(BaseIMClient):
         except Exception as err:
             logger.debug("Failed to send channel auth denial: %s", err)
 
+    async def _defer_interaction(self, interaction: Optional[discord.Interaction]) -> None:
+        """ACK an interaction before building a view so Discord's 3s window is met."""
+        if interaction is None or interaction.response.is_done():
+            return
+        try:
+            await interaction.response.defer(ephemeral=True)
+        except Exception as err:
+            logger.debug("Failed to defer Discord interaction: %s", err)
+
+    async def _send_modal_view(
+        self,
+        interaction: Optional[discord.Interaction],
+        channel_id: Optional[str],
+        view: discord.ui.View,
+        **kwargs: Any,
+    ) -> None:
+        """Post a view as an ephemeral follow-up to ``interaction``, or to the channel."""
+        async with self._modal_send_semaphore:
+            if interaction:
+                await interaction.followup.send(view=view, ephemeral=True, **kwargs)
+                return
+            channel = await self._fetch_channel(channel_id)
+            if channel is None:
+                raise RuntimeError("Discord channel not found")
+            await channel.send(view=view, **kwargs)
+
     async def _dismiss_interaction_message(self, interaction: discord.Interaction, fallback_text: str) -> None:
         """Delete the source interaction message, with edit fallback when delete is unavailable."""
         if interaction.message is not None:
@@ -885,48 +1158,37 @@ class DiscordBot(BaseIMClient):
         if message.author and message.author.bot:
             return
 
-        # Hot-reload config BEFORE reading any config values (require_mention, etc.)
-        if self._controller and hasattr(self._controller, "_refresh_config_from_disk"):
-            self._controller._refresh_config_from_disk()
-
+        # Cheap reject first: no config reload for messages with nothing to handle.
         content = self._clean_message_text(message.content)
+        if not content and not message.attachments:
+            return
 
-        channel = message.channel
-        channel_id, thread_id = self._extract_context_ids(channel)
+        # Hot-reload config BEFORE reading any config values (guild lists, require_mention, etc.)
+        if self._controller and hasattr(self._controller, "_refresh_config_from_disk"):
+            self._controller._refresh_config_from_disk()
 
         if message.guild and not self._is_allowed_guild(str(message.guild.id)):
             return
 
-        # File attachments
-        files = None
-        if message.attachments:
-            files = []
-            for attachment in message.attachments:
-                files.append(
-                    FileAttachment(
-                        name=attachment.filename,
-                        mimetype=attachment.content_type or "application/octet-stream",
-                        url=attachment.url,
-                        size=attachment.size,
-                    )
-                )
-
-        if not content and not files:
-            return
+        channel = message.channel
+        channel_id, thread_id = self._extract_context_ids(channel)
+        # Stringify ids once; they feed auth, thread checks and every context.
+        author_id = str(message.author.id)
+        message_id = str(message.id)
 
         # Determine if this is a DM
         is_dm = isinstance(channel, discord.DMChannel) or message.guild is None
         referenced_anchor_base = None if is_dm else self._get_reply_anchor_base(channel_id, self._get_reference_message_id(message))
 
         auth_result = self.check_authorization(
-            user_id=str(message.author.id),
+            user_id=author_id,
             channel_id=channel_id,
             is_dm=is_dm,
             text=content,
             settings_manager=self.settings_manager,
         )
         if not auth_result.allowed:
-            await self._send_auth_denial(channel_id, str(message.author.id), auth_result)
+            await self._send_auth_denial(channel_id, author_id, auth_result)
             return
 
         # Mention logic for guild channels
@@ -936,12 +1198,14 @@ class DiscordBot(BaseIMClient):
                 channel_id, global_default=self.config.require_mention
             )
 
-        mentioned_bot = bool(self.client.user and message.mentions and self.client.user in message.mentions)
+        # Compare ids once instead of repeated User.__eq__ scans of message.mentions.
+        bot_user = self.client.user
+        mentioned_bot = bot_user is not None and any(user.id == bot_user.id for user in message.mentions)
 
         if effective_require_mention and not is_dm:
             if isinstance(channel, discord.Thread):
                 if self.settings_manager:
-                    thread_active = self._is_thread_reply_allowed(str(message.author.id), channel_id, str(channel.id))
+                    thread_active = self._is_thread_reply_allowed(author_id, channel_id, thread_id)
                     if not thread_active:
                         return
                 else:
@@ -949,16 +1213,31 @@ class DiscordBot(BaseIMClient):
             else:
                 if referenced_anchor_base:
                     pass
-                elif not message.mentions or (self.client.user and self.client.user not in message.mentions):
+                elif not mentioned_bot:
                     return
 
         # Strip bot mention from content
-        if self.client.user:
-            bot_id = str(self.client.user.id)
-            content = content.replace(f"<@{bot_id}>", "").replace(f"<@!{bot_id}>", "").strip()
+        mention_re = self._get_mention_re() if "<@" in content else None
+        if mention_re is not None:
+            content = mention_re.sub("", content).strip()
+
+        # File attachments
+        files = (
+            [
+                FileAttachment(
+                    name=attachment.filename,
+                    mimetype=attachment.content_type or "application/octet-stream",
+                    url=attachment.url,
+                    size=attachment.size,
+                )
+                for attachment in message.attachments
+            ]
+            if message.attachments
+            else None
+        )
 
         allow_plain_bind = self.should_allow_plain_bind(
-            user_id=str(message.author.id),
+            user_id=author_id,
             is_dm=is_dm,
             settings_manager=self.settings_manager,
         )
@@ -966,10 +1245,10 @@ class DiscordBot(BaseIMClient):
         # Handle slash-like commands in plain messages
         if self.parse_text_command(content, allow_plain_bind=allow_plain_bind):
             command_context = MessageContext(
-                user_id=str(message.author.id),
+                user_id=author_id,
                 channel_id=channel_id,
                 thread_id=thread_id,
-                message_id=str(message.id),
+                message_id=message_id,
                 platform_specific={"message": message, "is_dm": is_dm},
                 files=files,
             )
@@ -979,10 +1258,10 @@ class DiscordBot(BaseIMClient):
         if not content and not files:
             if mentioned_bot and self.on_message_callback:
                 context = MessageContext(
-                    user_id=str(message.author.id),
+                    user_id=author_id,
                     channel_id=channel_id,
                     thread_id=thread_id,
-                    message_id=str(message.id),
+                    message_id=message_id,
                     platform_specific={"message": message, "is_dm": is_dm},
                     files=files,
                 )
@@ -990,10 +1269,10 @@ class DiscordBot(BaseIMClient):
             return
 
         context = MessageContext(
-            user_id=str(message.author.id),
+            user_id=author_id,
             channel_id=channel_id,
             thread_id=thread_id,
-            message_id=str(message.id),
+            message_id=message_id,
             platform_specific={"message": message, "is_dm": is_dm},
             files=files,
         )
@@ -1040,8 +1319,13 @@ class DiscordBot(BaseIMClient):
     ):
         interaction = trigger_id if isinstance(trigger_id, discord.Interaction) else None
 
+        # Option labels share a handful of prefixes; translate each one once.
+        prefixes: Dict[str, str] = {}
+
         def _prefixed_label(prefix_key: str, label: str, limit: int = 100) -> str:
-            prefix = self._t(prefix_key)
+            prefix = prefixes.get(prefix_key)
+            if prefix is None:
+                prefix = prefixes[prefix_key] = self._t(prefix_key)
             combined = f"{prefix}: {label}" if prefix else label
             if len(combined) > limit:
                 return combined[:limit]
@@ -1061,56 +1345,57 @@ class DiscordBot(BaseIMClient):
                     self.require_value = "false"
                 self.language_value = current_language or outer._get_lang()
                 self._save_callback = None
-                type_options = []
-                for mt in message_types:
-                    display_name = display_names.get(mt, mt)
-                    label = _prefixed_label("discord.labels.messageTypes", str(display_name))
-                    type_options.append(
-                        discord.SelectOption(
-                            label=label,
-                            value=mt,
-                            default=mt in self.selected_types,
-                        )
+                type_options = list(
+                    _select_options(
+                        tuple(
+                            (_prefixed_label("discord.labels.messageTypes", str(display_names.get(mt, mt))), mt)
+                            for mt in message_types
+                        ),
+                        frozenset(self.selected_types),
                     )
+                )
                 default_status = (
                     self.outer._t("modal.settings.mentionStatusOn")
                     if global_require_mention
                     else self.outer._t("modal.settings.mentionStatusOff")
                 )
-                require_options = [
-                    discord.SelectOption(
-                        label=_prefixed_label(
-                            "discord.labels.mentionPolicy",
-                            self.outer._t("modal.settings.optionDefault", status=default_status),
-                        ),
-                        value="__default__",
-                        default=self.require_value == "__default__",
-                    ),
-                    discord.SelectOption(
-                        label=_prefixed_label(
-                            "discord.labels.mentionPolicy",
-                            self.outer._t("modal.settings.optionRequireMention"),
+                require_options = list(
+                    _select_options(
+                        (
+                            (
+                                _prefixed_label(
+                                    "discord.labels.mentionPolicy",
+                                    self.outer._t("modal.settings.optionDefault", status=default_status),
+                                ),
+                                "__default__",
+                            ),
+                            (
+                                _prefixed_label(
+                                    "discord.labels.mentionPolicy",
+                                    self.outer._t("modal.settings.optionRequireMention"),
+                                ),
+                                "true",
+                            ),
+                            (
+                                _prefixed_label(
+                                    "discord.labels.mentionPolicy",
+                                    self.outer._t("modal.settings.optionDontRequireMention"),
+                                ),
+                                "false",
+                            ),
                         ),
-                        value="true",
-                        default=self.require_value == "true",
-                    ),
-                    discord.SelectOption(
-                        label=_prefixed_label(
-                            "discord.labels.mentionPolicy",
-                            self.outer._t("modal.settings.optionDontRequireMention"),
+                        self.require_value,
+                    )
+                )
+                language_options = list(
+                    _select_options(
+                        tuple(
+                            (_prefixed_label("discord.labels.language", lang), lang)
+                            for lang in get_supported_languages()
                         ),
-                        value="false",
-                        default=self.require_value == "false",
-                    ),
-                ]
-                language_options = [
-                    discord.SelectOption(
-                        label=_prefixed_label("discord.labels.language", lang),
-                        value=lang,
-                        default=lang == self.language_value,
+                        self.language_value,
                     )
-                    for lang in get_supported_languages()
-                ]
+                )
 
                 self.types_select = discord.ui.Select(
                     placeholder=self.outer._t("modal.settings.showMessageTypesPlaceholder"),
@@ -1248,33 +1533,29 @@ class DiscordBot(BaseIMClient):
         host_message_ts: Optional[str] = None,
     ):
         interaction = trigger_id if isinstance(trigger_id, discord.Interaction) else None
+        await self._defer_interaction(interaction)
         t = lambda key, **kw: self._t(key, channel_id, **kw)
         common_agents = ["claude", "codex", "opencode"]
         registered_backends = None
         if getattr(self, "_controller", None) and getattr(self._controller, "agent_service", None):
             registered_backends = list(self._controller.agent_service.agents.keys())
         allowed_agents = set(registered_backends or common_agents)
-        sessions = [item for item in sessions if item.agent in allowed_agents]
-
-        options = []
-        for item in sessions:
-            label = format_display_summary(item)
-            options.append(
-                discord.SelectOption(
-                    label=label[:100],
-                    value=f"{item.agent}|{item.native_session_id}",
-                    description=format_display_time(item)[:100],
-                )
+        # Discord caps a select at 25 options; stop filtering once we have them.
+        visible_sessions = itertools.islice((item for item in sessions if item.agent in allowed_agents), 25)
+
+        options = [
+            discord.SelectOption(
+                label=format_display_summary(item)[:100],
+                value=f"{item.agent}|{item.native_session_id}",
+                description=format_display_time(item)[:100],
             )
-        if len(options) > 25:
-            options = options[:25]
+            for item in visible_sessions
+        ]
         has_recent_sessions = bool(options)
         if not options:
             options = [discord.SelectOption(label=t("modal.resume.noRecentSessionsOption"), value="__none__")]
 
-        agent_options = [discord.SelectOption(label=agent, value=agent) for agent in sorted(allowed_agents)]
-        if len(agent_options) > 25:
-            agent_options = agent_options[:25]
+        agent_options = list(_select_options(tuple((agent, agent) for agent in sorted(allowed_agents)[:25])))
         if not agent_options:
             agent_options = [discord.SelectOption(label="default", value="opencode")]
 
@@ -1384,13 +1665,7 @@ class DiscordBot(BaseIMClient):
             ]
         )
 
-        if interaction:
-            await interaction.response.send_message(intro_text, view=view, ephemeral=True)
-        else:
-            channel = await self._fetch_channel(channel_id)
-            if channel is None:
-                raise RuntimeError("Discord channel not found")
-            await channel.send(intro_text, view=view)
+        await self._send_modal_view(interaction, channel_id, view, content=intro_text)
 
     async def open_routing_modal(
         self,
@@ -1408,6 +1683,8 @@ class DiscordBot(BaseIMClient):
         codex_models: list,
     ):
         interaction = trigger_id if isinstance(trigger_id, discord.Interaction) else None
+        # Building the view walks every agent/model list; ACK first.
+        await self._defer_interaction(interaction)
 
         backend_display_names = {
             "claude": "ClaudeCode",
@@ -1415,8 +1692,13 @@ class DiscordBot(BaseIMClient):
             "opencode": "OpenCode",
         }
 
+        # Every select change re-renders the view with the same labels; translate
+        # and prefix each one once per modal.
+        _text = functools.lru_cache(maxsize=None)(self._t)
+
+        @functools.lru_cache(maxsize=None)
         def _prefixed_label(prefix_key: str, label: str, limit: int = 100) -> str:
-            prefix = self._t(prefix_key)
+            prefix = _text(prefix_key)
             combined = f"{prefix}: {label}" if prefix else label
             if len(combined) > limit:
                 return combined[:limit]
@@ -1443,18 +1725,91 @@ class DiscordBot(BaseIMClient):
                 names.append(name)
             return names
 
+        # Inputs below are fixed for the life of this modal; work them out once
+        # rather than on every _render (each select change re-renders).
+        opencode_agent_names = _unique_agent_names(opencode_agents)
+        claude_agent_names = _unique_agent_names(claude_agents)
+        codex_agent_names = _unique_agent_names(codex_agents)
+        opencode_allowed_providers = resolve_opencode_allowed_providers(
+            opencode_default_config,
+            opencode_models,
+        )
+        opencode_model_entries: Dict[tuple, List[Dict[str, str]]] = {}
+
+        def _opencode_model_entries(preferred_providers: List[str]) -> List[Dict[str, str]]:
+            key = tuple(preferred_providers or ())
+            entries = opencode_model_entries.get(key)
+            if entries is None:
+                entries = build_opencode_model_option_items(
+                    opencode_models,
+                    max_total=24,
+                    preferred_providers=preferred_providers,
+                    allowed_providers=opencode_allowed_providers,
+                )
+                opencode_model_entries[key] = entries
+            return entries
+
+        backend_choices = tuple(
+            (
+                _prefixed_label("discord.labels.backend", backend_display_names.get(backend, backend.capitalize())),
+                backend,
+            )
+            for backend in registered_backends
+        )
+        opencode_render_states: Dict[tuple, tuple] = {}
+
+        def _opencode_render_state(agent: Optional[str], model: Optional[str]) -> tuple:
+            """Resolve the OpenCode default model, model choices and reasoning options for one selection."""
+            agent = agent if agent not in _DEFAULT_SENTINELS else None
+            model = model if model not in _DEFAULT_SENTINELS else None
+            key = (agent, model)
+            state = opencode_render_states.get(key)
+            if state is None:
+                default_model_str = resolve_opencode_default_model(opencode_default_config, opencode_agents, agent)
+                target_model = model or default_model_str
+                preferred_providers = resolve_opencode_provider_preferences(
+                    opencode_default_config,
+                    target_model,
+                )
+                model_choices = [
+                    (entry["label"], entry["value"])
+                    for entry in _opencode_model_entries(preferred_providers)
+                    if entry.get("label") and entry.get("value")
+                ]
+                reasoning_entries = build_reasoning_effort_options(opencode_models, target_model)
+                state = opencode_render_states[key] = (default_model_str, model_choices, reasoning_entries)
+            return state
+
+        codex_reasoning_entries = build_codex_reasoning_options()
+        _claude_reasoning_entries = functools.lru_cache(maxsize=None)(build_claude_reasoning_options)
+
+        @functools.lru_cache(maxsize=None)
+        def _claude_model_choices(current_model: Optional[str]) -> List[tuple[str, str]]:
+            return [
+                (format_claude_model_label(m), m)
+                for m in _prioritize_claude_model_choices(claude_models, current_model)[:24]
+            ]
+
         class RoutingView(discord.ui.View):
             def __init__(self, outer: DiscordBot, owner_id: Optional[str]):
                 super().__init__(timeout=900)
                 self.outer = outer
                 self.owner_id = owner_id
-                self.step = "backend"
                 self.selected_backend = current_backend or (
                     registered_backends[0] if registered_backends else "opencode"
                 )
-                stored_backend = getattr(current_routing, "agent_backend", None) if current_routing else None
-                canonical_model = getattr(current_routing, "model", None) if current_routing else None
-                canonical_reasoning = getattr(current_routing, "reasoning_effort", None) if current_routing else None
+                # RoutingSettings is a plain dataclass: read its fields from one
+                # dict, falling back to getattr for objects without a __dict__.
+                routing: Dict[str, Any]
+                if not current_routing:
+                    routing = {}
+                elif hasattr(current_routing, "__dict__"):
+                    routing = vars(current_routing)
+                else:
+                    routing = {name: getattr(current_routing, name, None) for name in _ROUTING_FIELDS}
+                stored_backend = routing.get("agent_backend")
+                canonical_model = routing.get("model")
+                canonical_reasoning = routing.get("reasoning_effort")
 
                 def _canonical_applies_to_backend(backend: str) -> bool:
                     if stored_backend:
@@ -1462,7 +1817,7 @@ class DiscordBot(BaseIMClient):
                     return backend == (current_backend or "opencode")
 
                 def _current_model(field_name: str, backend: str) -> Optional[str]:
-                    value = getattr(current_routing, field_name, None) if current_routing else None
+                    value = routing.get(field_name)
                     if value is not None:
                         return value
                     if self.selected_backend == backend and _canonical_applies_to_backend(backend):
@@ -1470,432 +1825,234 @@ class DiscordBot(BaseIMClient):
                     return None
 
                 def _current_reasoning(field_name: str, backend: str) -> Optional[str]:
-                    value = getattr(current_routing, field_name, None) if current_routing else None
+                    value = routing.get(field_name)
                     if value is not None:
                         return value
                     if self.selected_backend == backend and _canonical_applies_to_backend(backend):
                         return canonical_reasoning
                     return None
 
-                self.oc_agent = getattr(current_routing, "opencode_agent", None) if current_routing else None
+                self.oc_agent = routing.get("opencode_agent")
                 self.oc_model = _current_model("opencode_model", "opencode")
                 self.oc_reasoning = _current_reasoning("opencode_reasoning_effort", "opencode")
-                self.claude_agent = getattr(current_routing, "claude_agent", None) if current_routing else None
+                self.claude_agent = routing.get("claude_agent")
                 self.claude_model = _current_model("claude_model", "claude")
                 self.claude_reasoning = _current_reasoning("claude_reasoning_effort", "claude")
-                self.codex_agent = getattr(current_routing, "codex_agent", None) if current_routing else None
+                self.codex_agent = routing.get("codex_agent")
                 self.codex_model = _current_model("codex_model", "codex")
                 self.codex_reasoning = _current_reasoning("codex_reasoning_effort", "codex")
+                self._save_button = discord.ui.Button(
+                    label=self.outer._t("common.save"),
+                    style=discord.ButtonStyle.primary,
+                )
+                self._save_button.callback = self._on_save
+                # Rendered items per selection state, so flipping back to an
+                # earlier backend or value re-adds its selects instead of
+                # rebuilding them.
+                self._rendered_items: Dict[tuple, List[discord.ui.Item]] = {}
                 self._render()
 
             def _render(self):
                 self.clear_items()
-                options = []
-                for backend in registered_backends:
-                    display = backend_display_names.get(backend, backend.capitalize())
-                    label = _prefixed_label("discord.labels.backend", display)
-                    options.append(
-                        discord.SelectOption(
-                            label=label,
-                            value=backend,
-                            default=backend == self.selected_backend,
-                        )
-                    )
-                if len(options) > 25:
-                    options = options[:25]
-                backend_select = discord.ui.Select(
-                    placeholder=self.outer._t("modal.routing.selectBackend"),
-                    options=options,
-                    min_values=1,
-                    max_values=1,
+                key = (
+                    self.selected_backend,
+                    self.oc_agent,
+                    self.oc_model,
+                    self.oc_reasoning,
+                    self.claude_agent,
+                    self.claude_model,
+                    self.claude_reasoning,
+                    self.codex_agent,
+                    self.codex_model,
+                    self.codex_reasoning,
                 )
+                items = self._rendered_items.get(key)
+                if items is not None:
+                    for item in items:
+                        self.add_item(item)
+                    return
 
-                async def backend_callback(select_interaction: discord.Interaction):
-                    if backend_select.values:
-                        self.selected_backend = backend_select.values[0]
-                    self._render()
-                    updated_embed = discord.Embed(
-                        title=self._content(),
-                        description=self.outer._t("discord.routingSubtitle"),
-                    )
-                    await select_interaction.response.edit_message(embed=updated_embed, view=self)
-
-                backend_select.callback = backend_callback
-                self.add_item(backend_select)
+                self._add_select(
+                    "modal.routing.selectBackend",
+                    list(_select_options(backend_choices, self.selected_backend)),
+                    "selected_backend",
+                    rerender=True,
+                )
 
                 if self.selected_backend == "opencode":
-                    opencode_agent_names = _unique_agent_names(opencode_agents)
-                    default_model_str = resolve_opencode_default_model(
-                        opencode_default_config,
-                        opencode_agents,
-                        self.oc_agent if self.oc_agent not in ("__default__", None) else None,
-                    )
-                    target_model = self.oc_model if self.oc_model not in (None, "__default__") else default_model_str
-                    preferred_providers = resolve_opencode_provider_preferences(
-                        opencode_default_config,
-                        target_model,
+                    default_model_str, model_choices, reasoning_entries = _opencode_render_state(
+                        self.oc_agent, self.oc_model
                     )
-                    allowed_providers = resolve_opencode_allowed_providers(
-                        opencode_default_config,
-                        opencode_models,
-                    )
-                    agent_options = [
-                        discord.SelectOption(
-                            label=_prefixed_label(
-                                "discord.labels.opencodeAgent",
-                                self.outer._t("common.default"),
-                            ),
-                            value="__default__",
-                            default=self.oc_agent in (None, "__default__"),
-                        )
-                    ]
-                    agent_options += [
-                        discord.SelectOption(
-                            label=_prefixed_label("discord.labels.opencodeAgent", a),
-                            value=a,
-                            default=a == self.oc_agent,
-                        )
-                        for a in opencode_agent_names
-                    ]
-                    if len(agent_options) > 25:
-                        agent_options = agent_options[:25]
-                    agent_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectOpencodeAgent"),
-                        options=agent_options,
-                        min_values=1,
-                        max_values=1,
+                    self._add_agent_select(
+                        opencode_agent_names,
+                        self.oc_agent,
+                        "discord.labels.opencodeAgent",
+                        "modal.routing.selectOpencodeAgent",
+                        "oc_agent",
+                        prefix_names=True,
                     )
 
-                    async def agent_callback(select_interaction: discord.Interaction):
-                        if agent_select.values:
-                            self.oc_agent = agent_select.values[0]
-                        await select_interaction.response.defer()
-
-                    agent_select.callback = agent_callback
-                    self.add_item(agent_select)
-
-                    default_label = self.outer._t("common.default")
+                    default_label = _text("common.default")
                     if default_model_str:
                         default_label = f"{default_label} - {default_model_str}"
-                    model_options = [
-                        discord.SelectOption(
-                            label=_prefixed_label("discord.labels.model", default_label),
-                            value="__default__",
-                            default=self.oc_model in (None, "__default__"),
-                        )
-                    ]
-                    model_entries = build_opencode_model_option_items(
-                        opencode_models,
-                        max_total=24,
-                        preferred_providers=preferred_providers,
-                        allowed_providers=allowed_providers,
+                    self._add_model_select(
+                        default_label,
+                        model_choices,
+                        self.oc_model,
+                        "oc_model",
+                        rerender=True,
                     )
-                    for entry in model_entries:
-                        label = entry.get("label", "")
-                        value = entry.get("value", "")
-                        if not label or not value:
-                            continue
-                        model_options.append(
-                            discord.SelectOption(
-                                label=_prefixed_label("discord.labels.model", label),
-                                value=value,
-                                default=value == self.oc_model,
-                            )
-                        )
-                    model_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectModel"),
-                        options=model_options,
-                        min_values=1,
-                        max_values=1,
-                    )
-
-                    async def model_callback(select_interaction: discord.Interaction):
-                        if model_select.values:
-                            self.oc_model = model_select.values[0]
-                        self._render()
-                        updated_embed = discord.Embed(
-                            title=self._content(),
-                            description=self.outer._t("discord.routingSubtitle"),
-                        )
-                        await select_interaction.response.edit_message(embed=updated_embed, view=self)
-
-                    model_select.callback = model_callback
-                    self.add_item(model_select)
-
-                    reasoning_entries = build_reasoning_effort_options(opencode_models, target_model)
-                    selected_reasoning = (
-                        self.oc_reasoning if self.oc_reasoning not in (None, "__default__") else "__default__"
-                    )
-                    available_reasoning = {entry.get("value") for entry in reasoning_entries}
-                    if selected_reasoning not in available_reasoning:
-                        selected_reasoning = "__default__"
-                    reasoning_options = []
-                    for entry in reasoning_entries:
-                        value = entry.get("value")
-                        if not value:
-                            continue
-                        if value == "__default__":
-                            label = self.outer._t("common.default")
-                        else:
-                            translated = self.outer._t(f"reasoning.{value}")
-                            label = translated if translated != f"reasoning.{value}" else entry.get("label", value)
-                        reasoning_options.append(
-                            discord.SelectOption(
-                                label=_prefixed_label("discord.labels.reasoningEffort", label),
-                                value=value,
-                                default=value == selected_reasoning,
-                            )
-                        )
-                    reasoning_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectReasoningEffort"),
-                        options=reasoning_options,
-                        min_values=1,
-                        max_values=1,
+                    self._add_reasoning_select(
+                        reasoning_entries,
+                        self.oc_reasoning,
+                        "oc_reasoning",
                     )
 
-                    async def reasoning_callback(select_interaction: discord.Interaction):
-                        if reasoning_select.values:
-                            self.oc_reasoning = reasoning_select.values[0]
-                        await select_interaction.response.defer()
-
-                    reasoning_select.callback = reasoning_callback
-                    self.add_item(reasoning_select)
-
                 if self.selected_backend == "claude":
-                    claude_agent_names = _unique_agent_names(claude_agents)
-                    agent_options = [
-                        discord.SelectOption(
-                            label=_prefixed_label(
-                                "discord.labels.claudeAgent",
-                                self.outer._t("common.default"),
-                            ),
-                            value="__default__",
-                            default=self.claude_agent in (None, "__default__"),
-                        )
-                    ]
-                    agent_options += [
-                        discord.SelectOption(label=a, value=a, default=a == self.claude_agent)
-                        for a in claude_agent_names
-                    ]
-                    if len(agent_options) > 25:
-                        agent_options = agent_options[:25]
-                    agent_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectClaudeAgent"),
-                        options=agent_options,
-                        min_values=1,
-                        max_values=1,
+                    self._add_agent_select(
+                        claude_agent_names,
+                        self.claude_agent,
+                        "discord.labels.claudeAgent",
+                        "modal.routing.selectClaudeAgent",
+                        "claude_agent",
                     )
-
-                    async def claude_agent_callback(select_interaction: discord.Interaction):
-                        if agent_select.values:
-                            self.claude_agent = agent_select.values[0]
-                        await select_interaction.response.defer()
-
-                    agent_select.callback = claude_agent_callback
-                    self.add_item(agent_select)
-
-                    model_options = [
-                        discord.SelectOption(
-                            label=_prefixed_label("discord.labels.model", self.outer._t("common.default")),
-                            value="__default__",
-                            default=self.claude_model in (None, "__default__"),
-                        )
-                    ]
                     # Discord select menus cap at 25 options; prioritize the active
-                    # pick and the bare aliases so the truncation below only trims the
+                    # pick and the bare aliases so the truncation only trims the
                     # long tail of dated snapshots (see _prioritize_claude_model_choices).
-                    model_options += [
-                        discord.SelectOption(
-                            label=_prefixed_label("discord.labels.model", format_claude_model_label(m)),
-                            value=m,
-                            default=m == self.claude_model,
-                        )
-                        for m in _prioritize_claude_model_choices(claude_models, self.claude_model)
-                    ]
-                    if len(model_options) > 25:
-                        model_options = model_options[:25]
-                    model_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectModel"),
-                        options=model_options,
-                        min_values=1,
-                        max_values=1,
-                    )
-
-                    async def claude_model_callback(select_interaction: discord.Interaction):
-                        if model_select.values:
-                            self.claude_model = model_select.values[0]
-                            self.claude_reasoning = None
-                        self._render()
-                        updated_embed = discord.Embed(
-                            title=self._content(),
-                            description=self.outer._t("discord.routingSubtitle"),
-                        )
-                        await select_interaction.response.edit_message(embed=updated_embed, view=self)
-
-                    model_select.callback = claude_model_callback
-                    self.add_item(model_select)
-
-                    claude_reasoning_entries = build_claude_reasoning_options(
-                        self.claude_model if self.claude_model not in (None, "__default__") else None
+                    self._add_model_select(
+                        _text("common.default"),
+                        _claude_model_choices(self.claude_model),
+                        self.claude_model,
+                        "claude_model",
+                        rerender=True,
+                        reset_attr="claude_reasoning",
                     )
-                    selected_cl_reasoning = (
-                        self.claude_reasoning if self.claude_reasoning not in (None, "__default__") else "__default__"
-                    )
-                    available_cl_reasoning = {entry.get("value") for entry in claude_reasoning_entries}
-                    if selected_cl_reasoning not in available_cl_reasoning:
-                        selected_cl_reasoning = "__default__"
-                    reasoning_options = []
-                    for entry in claude_reasoning_entries:
-                        value = entry.get("value")
-                        if not value:
-                            continue
-                        if value == "__default__":
-                            label = self.outer._t("common.default")
-                        else:
-                            translated = self.outer._t(f"reasoning.{value}")
-                            label = translated if translated != f"reasoning.{value}" else entry.get("label", value)
-                        reasoning_options.append(
-                            discord.SelectOption(
-                                label=_prefixed_label("discord.labels.reasoningEffort", label),
-                                value=value,
-                                default=value == selected_cl_reasoning,
-                            )
-                        )
-                    reasoning_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectReasoningEffort"),
-                        options=reasoning_options,
-                        min_values=1,
-                        max_values=1,
+                    self._add_reasoning_select(
+                        _claude_reasoning_entries(
+                            self.claude_model if self.claude_model not in _DEFAULT_SENTINELS else None
+                        ),
+                        self.claude_reasoning,
+                        "claude_reasoning",
                     )
 
-                    async def claude_reasoning_callback(select_interaction: discord.Interaction):
-                        if reasoning_select.values:
-                            self.claude_reasoning = reasoning_select.values[0]
-                        await select_interaction.response.defer()
-
-                    reasoning_select.callback = claude_reasoning_callback
-                    self.add_item(reasoning_select)
-
                 if self.selected_backend == "codex":
-                    codex_agent_names = _unique_agent_names(codex_agents)
-                    agent_options = [
-                        discord.SelectOption(
-                            label=_prefixed_label(
-                                "discord.labels.codexAgent",
-                                self.outer._t("common.default"),
-                            ),
-                            value="__default__",
-                            default=self.codex_agent in (None, "__default__"),
-                        )
-                    ]
-                    agent_options += [
-                        discord.SelectOption(label=a, value=a, default=a == self.codex_agent)
-                        for a in codex_agent_names
-                    ]
-                    if len(agent_options) > 25:
-                        agent_options = agent_options[:25]
-                    agent_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectCodexAgent"),
-                        options=agent_options,
-                        min_values=1,
-                        max_values=1,
+                    self._add_agent_select(
+                        codex_agent_names,
+                        self.codex_agent,
+                        "discord.labels.codexAgent",
+                        "modal.routing.selectCodexAgent",
+                        "codex_agent",
                     )
-
-                    async def codex_agent_callback(select_interaction: discord.Interaction):
-                        if agent_select.values:
-                            self.codex_agent = agent_select.values[0]
-                        await select_interaction.response.defer()
-
-                    agent_select.callback = codex_agent_callback
-                    self.add_item(agent_select)
-
-                    model_options = [
-                        discord.SelectOption(
-                            label=_prefixed_label("discord.labels.model", self.outer._t("common.default")),
-                            value="__default__",
-                            default=self.codex_model in (None, "__default__"),
-                        )
-                    ]
-                    model_options += [
-                        discord.SelectOption(
-                            label=_prefixed_label("discord.labels.model", m),
-                            value=m,
-                            default=m == self.codex_model,
-                        )
-                        for m in codex_models
-                    ]
-                    if len(model_options) > 25:
-                        model_options = model_options[:25]
-                    model_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectModel"),
-                        options=model_options,
-                        min_values=1,
-                        max_values=1,
+                    self._add_model_select(
+                        _text("common.default"),
+                        [(m, m) for m in codex_models[:24]],
+                        self.codex_model,
+                        "codex_model",
                     )
-
-                    async def codex_model_callback(select_interaction: discord.Interaction):
-                        if model_select.values:
-                            self.codex_model = model_select.values[0]
-                        await select_interaction.response.defer()
-
-                    model_select.callback = codex_model_callback
-                    self.add_item(model_select)
-
-                    codex_reasoning_entries = build_codex_reasoning_options()
-                    selected_cx_reasoning = (
-                        self.codex_reasoning if self.codex_reasoning not in (None, "__default__") else "__default__"
+                    self._add_reasoning_select(
+                        codex_reasoning_entries,
+                        self.codex_reasoning,
+                        "codex_reasoning",
                     )
-                    available_cx_reasoning = {entry.get("value") for entry in codex_reasoning_entries}
-                    if selected_cx_reasoning not in available_cx_reasoning:
-                        selected_cx_reasoning = "__default__"
-                    reasoning_options = []
-                    for entry in codex_reasoning_entries:
-                        value = entry.get("value")
-                        if not value:
-                            continue
-                        if value == "__default__":
-                            label = self.outer._t("common.default")
-                        else:
-                            translated = self.outer._t(f"reasoning.{value}")
-                            label = translated if translated != f"reasoning.{value}" else entry.get("label", value)
-                        reasoning_options.append(
-                            discord.SelectOption(
-                                label=_prefixed_label("discord.labels.reasoningEffort", label),
-                                value=value,
-                                default=value == selected_cx_reasoning,
-                            )
-                        )
-                    reasoning_select = discord.ui.Select(
-                        placeholder=self.outer._t("modal.routing.selectReasoningEffort"),
-                        options=reasoning_options,
-                        min_values=1,
-                        max_values=1,
-                    )
-
-                    async def codex_reasoning_callback(select_interaction: discord.Interaction):
-                        if reasoning_select.values:
-                            self.codex_reasoning = reasoning_select.values[0]
-                        await select_interaction.response.defer()
 
-                    reasoning_select.callback = codex_reasoning_callback
-                    self.add_item(reasoning_select)
+                self.add_item(self._save_button)
+                self._rendered_items[key] = list(self.children)
 
-                save_button = discord.ui.Button(
-                    label=self.outer._t("common.save"),
-                    style=discord.ButtonStyle.primary,
+            async def _rerender(self, interaction: discord.Interaction):
+                self._render()
+                # The embed is static for the life of the modal; omitting it
+                # keeps the message's embed and sends only the components.
+                await interaction.response.edit_message(view=self)
+
+            def _add_select(
+                self,
+                placeholder_key: str,
+                options: List[discord.SelectOption],
+                attr: str,
+                rerender: bool = False,
+                reset_attr: Optional[str] = None,
+            ) -> None:
+                select = discord.ui.Select(
+                    placeholder=_text(placeholder_key),
+                    options=options[:25],
+                    min_values=1,
+                    max_values=1,
                 )
-                save_button.callback = self._on_save
-                self.add_item(save_button)
+                select.callback = functools.partial(self._on_select, select, attr, rerender, reset_attr)
+                self.add_item(select)
+
+            async def _on_select(
+                self,
+                select: discord.ui.Select,
+                attr: str,
+                rerender: bool,
+                reset_attr: Optional[str],
+                interaction: discord.Interaction,
+            ) -> None:
+                changed = False
+                if select.values and getattr(self, attr) != select.values[0]:
+                    setattr(self, attr, select.values[0])
+                    if reset_attr:
+                        setattr(self, reset_attr, None)
+                    changed = True
+                # Re-picking the current value (a common double-click) leaves
+                # the rendered options valid, so skip the rebuild.
+                if rerender and changed:
+                    await self._rerender(interaction)
+                else:
+                    await interaction.response.defer()
+
+            def _add_agent_select(
+                self,
+                names: List[str],
+                current: Optional[str],
+                label_key: str,
+                placeholder_key: str,
+                attr: str,
+                prefix_names: bool = False,
+            ) -> None:
+                choices = [(_prefixed_label(label_key, _text("common.default")), "__default__")]
+                choices += [(_prefixed_label(label_key, a) if prefix_names else a, a) for a in names[:24]]
+                selected = "__default__" if current in _DEFAULT_SENTINELS else current
+                self._add_select(placeholder_key, list(_select_options(tuple(choices), selected)), attr)
+
+            def _add_model_select(
+                self,
+                default_label: str,
+                models: List[tuple[str, str]],
+                current: Optional[str],
+                attr: str,
+                rerender: bool = False,
+                reset_attr: Optional[str] = None,
+            ) -> None:
+                choices = [(_prefixed_label("discord.labels.model", default_label), "__default__")]
+                choices += [(_prefixed_label("discord.labels.model", label), value) for label, value in models]
+                selected = "__default__" if current in _DEFAULT_SENTINELS else current
+                options = list(_select_options(tuple(choices), selected))
+                self._add_select("modal.routing.selectModel", options, attr, rerender=rerender, reset_attr=reset_attr)
+
+            def _add_reasoning_select(self, entries: List[Dict[str, str]], current: Optional[str], attr: str) -> None:
+                selected = current if current not in _DEFAULT_SENTINELS else "__default__"
+                if selected not in {entry.get("value") for entry in entries}:
+                    selected = "__default__"
+                choices = []
+                for entry in entries:
+                    value = entry.get("value")
+                    if not value:
+                        continue
+                    if value == "__default__":
+                        label = _text("common.default")
+                    else:
+                        translated = _text(f"reasoning.{value}")
+                        label = translated if translated != f"reasoning.{value}" else entry.get("label", value)
+                    choices.append((_prefixed_label("discord.labels.reasoningEffort", label), value))
+                options = list(_select_options(tuple(choices), selected))
+                self._add_select("modal.routing.selectReasoningEffort", options, attr)
 
             def _content(self) -> str:
-                return f"🤖 {self.outer._t('modal.routing.title')}"
+                return f"🤖 {_text('modal.routing.title')}"
 
             async def _on_save(self, interaction: discord.Interaction):
-                def _normalize(value: Optional[str]) -> Optional[str]:
-                    if value in (None, "__default__"):
-                        return None
-                    return value
-
                 try:
                     await interaction.response.defer()
                     # Re-check auth before saving (defense-in-depth)
@@ -1913,32 +2070,40 @@ class DiscordBot(BaseIMClient):
                         await self.outer._send_auth_denial(save_cid, save_uid, auth, interaction=interaction)
                         return
 
+                    # Dismiss the picker before persisting so the user is not left
+                    # on a spinner while the update runs; failures are reported
+                    # as an ephemeral follow-up instead.
+                    await self.outer._dismiss_interaction_message(
+                        interaction,
+                        f"✅ {self.outer._t('common.submitted')}",
+                    )
                     if hasattr(self.outer, "_on_routing_update"):
+                        routing_values = [
+                            None if value in _DEFAULT_SENTINELS else value
+                            for value in (
+                                self.oc_agent,
+                                self.oc_model,
+                                self.oc_reasoning,
+                                self.claude_agent,
+                                self.claude_model,
+                                self.claude_reasoning,
+                                self.codex_agent,
+                                self.codex_model,
+                                self.codex_reasoning,
+                            )
+                        ]
                         await self.outer._on_routing_update(
                             str(interaction.user.id),
                             channel_id,
                             self.selected_backend,
-                            _normalize(self.oc_agent),
-                            _normalize(self.oc_model),
-                            _normalize(self.oc_reasoning),
-                            _normalize(self.claude_agent),
-                            _normalize(self.claude_model),
-                            _normalize(self.claude_reasoning),
-                            _normalize(self.codex_agent),
-                            _normalize(self.codex_model),
-                            _normalize(self.codex_reasoning),
+                            *routing_values,
                             notify_user=True,
                             is_dm=interaction.guild is None,
                         )
-                    await self.outer._dismiss_interaction_message(
-                        interaction,
-                        f"✅ {self.outer._t('common.submitted')}",
-                    )
                 except Exception as err:
-                    await interaction.edit_original_response(
+                    await interaction.followup.send(
                         content=f"❌ {self.outer._t('error.routingUpdateFailed', error=str(err))}",
-                        embed=None,
-                        view=None,
+                        ephemeral=True,
                     )
 
         owner_id = str(interaction.user.id) if interaction else None
@@ -1948,13 +2113,7 @@ class DiscordBot(BaseIMClient):
             title=view._content(),
             description=self._t("discord.routingSubtitle"),
         )
-        if interaction:
-            await interaction.response.send_message(embed=routing_embed, view=view, ephemeral=True)
-        else:
-            channel = await self._fetch_channel(channel_id)
-            if channel is None:
-                raise RuntimeError("Discord channel not found")
-            await channel.send(embed=routing_embed, view=view)
+        await self._send_modal_view(interaction, channel_id, view, embed=routing_embed)
 
     async def open_question_modal(
         self,
@@ -1974,6 +2133,7 @@ class DiscordBot(BaseIMClient):
                 "Too many questions for Discord UI. Please reply with a custom message.",
             )
             return
+        await self._defer_interaction(interaction)
 
         def _normalize_question(raw: Any) -> tuple[str, list, bool]:
             if isinstance(raw, dict):
@@ -1993,18 +2153,21 @@ class DiscordBot(BaseIMClient):
                     return str(label)
             return str(option)
 
+        # Normalize up front so the view only lays out ready-made labels.
+        normalized_questions: list[tuple[str, list[str], bool]] = []
+        for q in questions:
+            header, options_raw, multiple = _normalize_question(q)
+            labels = [label[:100] for label in itertools.islice(filter(None, map(_normalize_option, options_raw)), 25)]
+            normalized_questions.append((header, labels, multiple))
+
         class QuestionView(discord.ui.View):
             def __init__(self, outer: DiscordBot):
                 super().__init__(timeout=900)
                 self.outer = outer
-                self.answers: list[list[str]] = [[] for _ in questions]
-                for idx, q in enumerate(questions):
-                    header, options_raw, multiple = _normalize_question(q)
-                    option_labels = [_normalize_option(opt) for opt in options_raw]
-                    option_labels = [label for label in option_labels if label]
-                    if len(option_labels) > 25:
-                        option_labels = option_labels[:25]
-                    options = [discord.SelectOption(label=label[:100], value=label[:100]) for label in option_labels]
+                self.answers: list[Optional[list[str]]] = [None] * len(questions)
+                self._answer_index: Dict[str, int] = {}
+                for idx, (header, labels, multiple) in enumerate(normalized_questions):
+                    options = [discord.SelectOption(label=label, value=label) for label in labels]
                     max_values = len(options) if multiple else 1
                     select = discord.ui.Select(
                         placeholder=header or f"Question {idx + 1}",
@@ -2012,21 +2175,30 @@ class DiscordBot(BaseIMClient):
                         min_values=1,
                         max_values=max_values,
                     )
-
-                    async def make_callback(select_interaction: discord.Interaction, i=idx, sel=select):
-                        self.answers[i] = list(sel.values)
-                        await select_interaction.response.defer()
-
-                    select.callback = make_callback
+                    # Selects keep their auto-generated custom_ids (unique across
+                    # open views); map them back to the question index.
+                    self._answer_index[select.custom_id] = idx
+                    select.callback = self._on_answer
                     self.add_item(select)
-                self.add_item(discord.ui.Button(label="Submit", style=discord.ButtonStyle.primary))
+                self.submit_button = discord.ui.Button(label="Submit", style=discord.ButtonStyle.primary)
+                self.add_item(self.submit_button)
+
+            async def _on_answer(self, select_interaction: discord.Interaction):
+                data = select_interaction.data or {}
+                idx = self._answer_index.get(str(data.get("custom_id")))
+                if idx is not None:
+                    self.answers[idx] = list(data.get("values") or [])
+                await select_interaction.response.defer()
 
         view = QuestionView(self)
 
         async def submit_callback(submit_interaction: discord.Interaction):
-            payload = {"answers": view.answers}
             if self.on_callback_query_callback:
-                callback_data = f"{callback_prefix}:modal:" + json.dumps(payload)
+                payload = {"answers": [answer or [] for answer in view.answers]}
+                # Compact separators; the payload goes straight to the handler.
+                callback_data = f"{callback_prefix}:modal:" + json.dumps(
+                    payload, separators=(",", ":"), ensure_ascii=False
+                )
                 ctx = MessageContext(
                     user_id=str(submit_interaction.user.id),
                     channel_id=context.channel_id,
@@ -2040,20 +2212,9 @@ class DiscordBot(BaseIMClient):
                 await self.on_callback_query_callback(ctx, callback_data)
             await submit_interaction.response.edit_message(content="✅ Answer submitted.", view=None)
 
-        for item in view.children:
-            if isinstance(item, discord.ui.Button) and item.label == "Submit":
-                item.callback = submit_callback
+        view.submit_button.callback = submit_callback
 
-        if interaction:
-            if interaction.response.is_done():
-                await interaction.followup.send("Please answer:", view=view, ephemeral=True)
-            else:
-                await interaction.response.send_message("Please answer:", view=view, ephemeral=True)
-        else:
-            channel = await self._fetch_channel(context.thread_id or context.channel_id)
-            if channel is None:
-                raise RuntimeError("Discord channel not found")
-            await channel.send("Please answer:", view=view)
+        await self._send_modal_view(interaction, context.thread_id or context.channel_id, view, content="Please answer:")
 
 class _PersistentStartView(discord.ui.View):
     """Persistent view for /start menu buttons.
@@ -2155,6 +2316,9 @@ class _PersistentStartView(discord.ui.View):
         return True
 
 
+_MODAL_CALLBACK_DATA = frozenset({"cmd_change_cwd", "cmd_settings", "cmd_routing", "cmd_resume"})
+
+
 class _DiscordButtonView(discord.ui.View):
     """Non-persistent view for dynamic buttons (update prompts, question modals, etc.)."""
 
@@ -2177,47 +2341,47 @@ class _DiscordButtonView(discord.ui.View):
                     custom_id=button.callback_data,
                     row=row_idx,
                 )
+                item.callback = self._on_click
+                self.add_item(item)
 
-                async def on_click(interaction: discord.Interaction, data=button.callback_data):
-                    needs_modal = data.endswith(":open_modal") or data in {
-                        "cmd_change_cwd",
-                        "cmd_settings",
-                        "cmd_routing",
-                        "cmd_resume",
-                    }
-                    if data.startswith("opencode_question:") or not needs_modal:
-                        try:
-                            await interaction.response.defer(ephemeral=True)
-                        except Exception:
-                            pass
-
-                    if not self.outer._mark_interaction_seen(interaction, data):
-                        logger.info("Ignoring duplicate Discord interaction: %s", data)
-                        return
+    async def _on_click(self, interaction: discord.Interaction):
+        # custom_id is the button's callback_data, so one handler serves all buttons.
+        data = str((interaction.data or {}).get("custom_id") or "")
+        needs_modal = data.endswith(":open_modal") or data in _MODAL_CALLBACK_DATA
+        if data.startswith("opencode_question:") or not needs_modal:
+            try:
+                await interaction.response.defer(ephemeral=True)
+            except Exception:
+                pass
 
-                    context = self.outer._build_interaction_context(interaction)
-                    if context is None:
-                        return
-                    auth_result = self.outer.check_authorization(
-                        user_id=context.user_id,
-                        channel_id=context.channel_id,
-                        is_dm=bool((context.platform_specific or {}).get("is_dm", False)),
-                        action=data,
-                        settings_manager=self.outer.settings_manager,
-                    )
-                    if not auth_result.allowed:
-                        await self.outer._send_auth_denial(
-                            context.channel_id, context.user_id, auth_result, interaction=interaction
-                        )
-                        return
+        if self.outer.on_callback_query_callback is None:
+            # Nothing would consume the click; skip context and auth work.
+            return
 
-                    if needs_modal:
-                        await self.outer._dispatch_callback_query(context, data)
-                    else:
-                        self.outer._spawn_callback_query_task(context, data)
+        if not self.outer._mark_interaction_seen(interaction, data):
+            logger.info("Ignoring duplicate Discord interaction: %s", data)
+            return
 
-                item.callback = on_click
-                self.add_item(item)
+        context = self.outer._build_interaction_context(interaction)
+        if context is None:
+            return
+        auth_result = self.outer.check_authorization(
+            user_id=context.user_id,
+            channel_id=context.channel_id,
+            is_dm=bool((context.platform_specific or {}).get("is_dm", False)),
+            action=data,
+            settings_manager=self.outer.settings_manager,
+        )
+        if not auth_result.allowed:
+            await self.outer._send_auth_denial(
+                context.channel_id, context.user_id, auth_result, interaction=interaction
+            )
+            return
+
+        if needs_modal:
+            await self.outer._dispatch_callback_query(context, data)
+        else:
+            self.outer._spawn_callback_query_task(context, data)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if self.owner_id and str(interaction.user.id) != self.owner_id:
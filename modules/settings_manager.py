@@ -330,7 +330,7 @@ class SettingsManager:
         """Get raw ChannelSettings for a channel without creating defaults."""
         self._reload_if_changed()
         key = str(channel_id)
-        return self.store.get_channels_for_platform(self.platform).get(key)
+        return self.store.find_channel(key, platform=self.platform)
 
     def has_guild_scope(self) -> bool:
         """Return whether this platform has an explicit server access policy."""
@@ -450,7 +450,7 @@ class SettingsManager:
         """
         self._reload_if_changed()
         key = str(channel_id)
-        channel_settings = self.store.get_channels_for_platform(self.platform).get(key)
+        channel_settings = self.store.find_channel(key, platform=self.platform)
 
         if channel_settings is not None and channel_settings.require_mention is not None:
             return channel_settings.require_mention
@@ -474,7 +474,7 @@ class SettingsManager:
         """Get the raw per-channel require_mention override (may be None)."""
         self._reload_if_changed()
         key = str(channel_id)
-        channel_settings = self.store.get_channels_for_platform(self.platform).get(key)
+        channel_settings = self.store.find_channel(key, platform=self.platform)
         if channel_settings is not None:
             return channel_settings.require_mention
         return None
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.im import InlineButton, InlineKeyboard, MessageContext
+from modules.im.discord import DiscordBot, _DiscordButtonView
+
+
+class _FakeResponse:
+    def __init__(self):
+        self.deferred = 0
+
+    async def defer(self, **kwargs):
+        self.deferred += 1
+
+
+class DiscordButtonViewTests(unittest.IsolatedAsyncioTestCase):
+    async def test_buttons_share_one_handler_keyed_by_custom_id(self):
+        bot = object.__new__(DiscordBot)
+        bot.settings_manager = None
+        bot.on_callback_query_callback = lambda ctx, data: None
+        spawned = []
+        dispatched = []
+        context = MessageContext(user_id="U1", channel_id="C1", platform="discord")
+        bot._mark_interaction_seen = lambda interaction, data: True
+        bot._build_interaction_context = lambda interaction: context
+        bot.check_authorization = lambda **kwargs: SimpleNamespace(allowed=True)
+        bot._spawn_callback_query_task = lambda ctx, data: spawned.append(data)
+
+        async def _dispatch_callback_query(ctx, data):
+            dispatched.append(data)
+
+        bot._dispatch_callback_query = _dispatch_callback_query
+        keyboard = InlineKeyboard(
+            buttons=[[InlineButton(text="Stop", callback_data="stop"), InlineButton("Settings", "cmd_settings")]]
+        )
+        view = _DiscordButtonView(bot, context, keyboard)
+
+        stop, settings = view.children
+        self.assertEqual(stop.callback.__func__, settings.callback.__func__)
+
+        interaction = SimpleNamespace(data={"custom_id": "stop"}, response=_FakeResponse())
+        await stop.callback(interaction)
+        await settings.callback(SimpleNamespace(data={"custom_id": "cmd_settings"}, response=_FakeResponse()))
+
+        self.assertEqual(interaction.response.deferred, 1)
+        self.assertEqual(spawned, ["stop"])
+        self.assertEqual(dispatched, ["cmd_settings"])
+
+    async def test_click_without_handler_skips_context_build(self):
+        bot = object.__new__(DiscordBot)
+        bot.on_callback_query_callback = None
+        built = []
+        bot._build_interaction_context = lambda interaction: built.append(interaction)
+        context = MessageContext(user_id="U1", channel_id="C1", platform="discord")
+        view = _DiscordButtonView(bot, context, InlineKeyboard(buttons=[[InlineButton("Stop", "stop")]]))
+
+        interaction = SimpleNamespace(data={"custom_id": "stop"}, response=_FakeResponse())
+        await view.children[0].callback(interaction)
+
+        self.assertEqual(interaction.response.deferred, 1)
+        self.assertEqual(built, [])
+
+    async def test_question_selects_share_one_answer_handler(self):
+        bot = object.__new__(DiscordBot)
+        sent = []
+
+        class _Channel:
+            async def send(self, content, view=None):
+                sent.append(view)
+
+        async def _fetch_channel(channel_id):
+            return _Channel()
+
+        bot._fetch_channel = _fetch_channel
+        bot._modal_send_semaphore = asyncio.Semaphore(8)
+        context = MessageContext(user_id="U1", channel_id="C1", platform="discord")
+        pending = {"questions": [{"header": "Color", "options": ["red", "blue"]}, {"header": "Size", "options": ["S"]}]}
+
+        await bot.open_question_modal(context, context, pending)
+
+        view = sent[0]
+        first, second = [item for item in view.children if hasattr(item, "options")]
+        self.assertEqual(first.callback.__func__, second.callback.__func__)
+
+        response = _FakeResponse()
+        await second.callback(SimpleNamespace(data={"custom_id": second.custom_id, "values": ["S"]}, response=response))
+
+        self.assertEqual(view.answers, [None, ["S"]])
+        self.assertEqual(response.deferred, 1)
+
+    async def test_question_submit_sends_compact_answers_payload(self):
+        bot = object.__new__(DiscordBot)
+        sent = []
+        callbacks = []
+
+        class _Channel:
+            async def send(self, content, view=None):
+                sent.append(view)
+
+        async def _fetch_channel(channel_id):
+            return _Channel()
+
+        async def _on_callback_query(ctx, data):
+            callbacks.append(data)
+
+        bot._fetch_channel = _fetch_channel
+        bot._modal_send_semaphore = asyncio.Semaphore(8)
+        bot.on_callback_query_callback = _on_callback_query
+        context = MessageContext(user_id="U1", channel_id="C1", platform="discord")
+        await bot.open_question_modal(context, context, {"questions": [{"header": "Pick", "options": ["é", "b"]}]})
+
+        view = sent[0]
+        view.answers[0] = ["é"]
+        edits = []
+
+        async def _edit_message(**kwargs):
+            edits.append(kwargs)
+
+        submit = view.children[-1]
+        await submit.callback(
+            SimpleNamespace(user=SimpleNamespace(id=1), response=SimpleNamespace(edit_message=_edit_message))
+        )
+
+        self.assertEqual(callbacks, ['claude_question:modal:{"answers":[["é"]]}'])
+        self.assertEqual(edits[0]["view"], None)
+
+    async def test_modal_view_sends_are_bounded_by_semaphore(self):
+        bot = object.__new__(DiscordBot)
+        bot._modal_send_semaphore = asyncio.Semaphore(1)
+        in_flight = 0
+        peak = 0
+
+        class _Channel:
+            async def send(self, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def _fetch_channel(channel_id):
+            return _Channel()
+
+        bot._fetch_channel = _fetch_channel
+        await asyncio.gather(
+            bot._send_modal_view(None, "C1", None, content="a"),
+            bot._send_modal_view(None, "C2", None, content="b"),
+        )
+
+        self.assertEqual(peak, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+from collections import OrderedDict
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.im import MessageContext
+from modules.im import discord as discord_module
+from modules.im.discord import DiscordBot
+
+
+class _FakeClient:
+    def __init__(self):
+        self.fetch_calls: list[int] = []
+
+    def get_channel(self, channel_id):
+        return None
+
+    def get_user(self, user_id):
+        return None
+
+    async def fetch_user(self, user_id):
+        self.fetch_calls.append(user_id)
+        return SimpleNamespace(id=user_id, name=f"user{user_id}", display_name=f"User {user_id}")
+
+    async def fetch_channel(self, channel_id):
+        self.fetch_calls.append(channel_id)
+        if channel_id == 404:
+            raise RuntimeError("unknown channel")
+        return SimpleNamespace(id=channel_id)
+
+
+def _bot() -> DiscordBot:
+    bot = object.__new__(DiscordBot)
+    bot.client = _FakeClient()
+    bot._fetched_channels = OrderedDict()
+    bot._user_info_cache = OrderedDict()
+
+    async def _run_on_client_loop(coro):
+        return await coro
+
+    bot._run_on_client_loop = _run_on_client_loop
+    return bot
+
+
+class DiscordChannelCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_fetched_channel_is_reused_within_ttl(self):
+        bot = _bot()
+
+        first = await bot._fetch_channel("123")
+        second = await bot._fetch_channel("123")
+
+        self.assertIs(first, second)
+        self.assertEqual(bot.client.fetch_calls, [123])
+
+    async def test_int_channel_id_shares_cache_entry_with_str(self):
+        bot = _bot()
+
+        first = await bot._fetch_channel("123")
+        second = await bot._fetch_channel(123)
+
+        self.assertIs(first, second)
+        self.assertEqual(bot.client.fetch_calls, [123])
+
+    async def test_expired_entry_is_refetched(self):
+        bot = _bot()
+        with patch.object(discord_module.time, "monotonic", return_value=1000.0):
+            await bot._fetch_channel("123")
+        later = 1000.0 + discord_module.FETCHED_CHANNEL_CACHE_TTL_SECONDS
+        with patch.object(discord_module.time, "monotonic", return_value=later):
+            await bot._fetch_channel("123")
+
+        self.assertEqual(bot.client.fetch_calls, [123, 123])
+
+    async def test_failed_fetch_is_not_cached(self):
+        bot = _bot()
+
+        self.assertIsNone(await bot._fetch_channel("404"))
+        self.assertIsNone(await bot._fetch_channel("404"))
+
+        self.assertEqual(bot.client.fetch_calls, [404, 404])
+        self.assertNotIn(404, bot._fetched_channels)
+
+    async def test_cache_evicts_least_recently_used(self):
+        bot = _bot()
+        with patch.object(discord_module, "FETCHED_CHANNEL_CACHE_MAX", 2):
+            await bot._fetch_channel("1")
+            await bot._fetch_channel("2")
+            await bot._fetch_channel("1")
+            await bot._fetch_channel("3")
+
+        self.assertEqual(list(bot._fetched_channels), [1, 3])
+
+    async def test_send_to_deleted_channel_drops_cached_entry(self):
+        bot = _bot()
+        response = SimpleNamespace(status=404, reason="Not Found")
+
+        async def _send(**kwargs):
+            raise discord_module.discord.NotFound(response, "Unknown Channel")
+
+        channel = SimpleNamespace(id=123, send=_send)
+        bot._fetched_channels[123] = (discord_module.time.monotonic(), channel)
+        bot.settings_manager = None
+
+        async def _resolve_target(context):
+            return channel
+
+        bot._resolve_target = _resolve_target
+
+        with self.assertRaises(discord_module.discord.NotFound):
+            await bot.send_message(SimpleNamespace(thread_id=None), "hello")
+
+        self.assertNotIn(123, bot._fetched_channels)
+
+    async def test_resolve_target_looks_up_thread_and_channel_concurrently(self):
+        bot = _bot()
+        in_flight = 0
+        peak = 0
+
+        async def _fetch_channel(channel_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return None if channel_id == "T1" else SimpleNamespace(id=channel_id)
+
+        bot._fetch_channel = _fetch_channel
+        context = MessageContext(user_id="U1", channel_id="C1", thread_id="T1", platform="discord")
+
+        target = await bot._resolve_target(context)
+
+        self.assertEqual(target.id, "C1")
+        self.assertEqual(peak, 2)
+
+    async def test_resolve_target_returns_cached_thread_without_lookups(self):
+        bot = _bot()
+        thread = object.__new__(discord_module.discord.Thread)
+        bot.client.get_channel = lambda channel_id: thread if channel_id == 77 else None
+
+        async def _fetch_channel(channel_id):
+            raise AssertionError("cached thread should not trigger a lookup")
+
+        bot._fetch_channel = _fetch_channel
+        context = MessageContext(user_id="U1", channel_id="C1", thread_id="77", platform="discord")
+
+        self.assertIs(await bot._resolve_target(context), thread)
+
+    async def test_user_info_is_cached_until_ttl_or_user_update(self):
+        bot = _bot()
+
+        with patch.object(discord_module.time, "monotonic", return_value=1000.0):
+            first = await bot.get_user_info("7")
+            self.assertIs(await bot.get_user_info("7"), first)
+        self.assertEqual(bot.client.fetch_calls, [7])
+
+        later = 1000.0 + discord_module.USER_INFO_CACHE_TTL_SECONDS
+        with patch.object(discord_module.time, "monotonic", return_value=later):
+            await bot.get_user_info("7")
+        self.assertEqual(bot.client.fetch_calls, [7, 7])
+
+        await bot._on_user_update_event(None, SimpleNamespace(id=7))
+        self.assertNotIn("7", bot._user_info_cache)
+
+    async def test_reactions_use_partial_message_without_fetching(self):
+        bot = _bot()
+        reactions = []
+
+        class _Target:
+            def get_partial_message(self, message_id):
+                async def _add_reaction(emoji):
+                    reactions.append((message_id, emoji))
+
+                return SimpleNamespace(add_reaction=_add_reaction)
+
+            async def fetch_message(self, message_id):
+                raise AssertionError("fetch_message should not be called")
+
+        async def _resolve_target(context):
+            return _Target()
+
+        bot._resolve_target = _resolve_target
+
+        self.assertTrue(await bot.add_reaction(SimpleNamespace(platform_specific=None), "55", ":eyes:"))
+        self.assertEqual(reactions, [(55, "👀")])
+
+    async def test_reaction_on_inbound_message_skips_target_resolution(self):
+        bot = _bot()
+        reactions = []
+
+        async def _add_reaction(emoji):
+            reactions.append(emoji)
+
+        async def _resolve_target(context):
+            raise AssertionError("target should not be resolved")
+
+        bot._resolve_target = _resolve_target
+        message = SimpleNamespace(id=55, add_reaction=_add_reaction)
+        context = SimpleNamespace(platform_specific={"message": message})
+
+        self.assertTrue(await bot.add_reaction(context, "55", "eyes"))
+        self.assertEqual(reactions, ["👀"])
+
+    async def test_send_many_resolves_target_once_and_keeps_order(self):
+        bot = _bot()
+        bot.settings_manager = None
+        sent = []
+        resolves = 0
+
+        async def _send(content):
+            if content == "boom":
+                raise RuntimeError("rate limited")
+            sent.append(content)
+            return SimpleNamespace(id=len(sent))
+
+        async def _resolve_target(context):
+            nonlocal resolves
+            resolves += 1
+            return SimpleNamespace(send=_send)
+
+        bot._resolve_target = _resolve_target
+
+        ids = await bot.send_many(SimpleNamespace(thread_id=None), ["a", "b", "boom", "c"])
+
+        self.assertEqual(ids, ["1", "2"])
+        self.assertEqual(sent, ["a", "b"])
+        self.assertEqual(resolves, 1)
+
+    async def test_send_many_to_deleted_channel_drops_cached_entry(self):
+        bot = _bot()
+        bot.settings_manager = None
+        response = SimpleNamespace(status=404, reason="Not Found")
+
+        async def _send(content):
+            raise discord_module.discord.NotFound(response, "Unknown Channel")
+
+        channel = SimpleNamespace(id=123, send=_send)
+        bot._fetched_channels[123] = (discord_module.time.monotonic(), channel)
+
+        async def _resolve_target(context):
+            return channel
+
+        bot._resolve_target = _resolve_target
+
+        ids = await bot.send_many(SimpleNamespace(thread_id=None), ["a", "b"])
+
+        self.assertEqual(ids, [])
+        self.assertNotIn(123, bot._fetched_channels)
+
+    def test_thread_activity_is_refreshed_at_most_once_per_window(self):
+        bot = _bot()
+        bot._thread_marked_at = OrderedDict()
+        marks = []
+        bot.settings_manager = object()
+        bot.sessions = SimpleNamespace(mark_thread_active=lambda *args: marks.append(args))
+        context = MessageContext(user_id="U1", channel_id="C1", thread_id="T1")
+
+        with patch.object(discord_module.time, "monotonic", return_value=1000.0):
+            bot._mark_thread_active(context)
+            bot._mark_thread_active(context)
+        with patch.object(discord_module.time, "monotonic", return_value=1061.0):
+            bot._mark_thread_active(context)
+
+        self.assertEqual(marks, [("U1", "C1", "T1"), ("U1", "C1", "T1")])
+
+    async def test_channel_auth_denial_is_posted_once_per_user_per_window(self):
+        bot = _bot()
+        bot._auth_denial_sent_at = {}
+        bot._auth_denial_dedupe_ttl_seconds = 30.0
+        bot.build_auth_denial_text = lambda denial, channel_id: "not enabled"
+        sent = []
+
+        async def _send(content):
+            sent.append(content)
+
+        async def _fetch_channel(channel_id):
+            return SimpleNamespace(send=_send)
+
+        bot._fetch_channel = _fetch_channel
+        denial = SimpleNamespace(denial="unbound_channel")
+
+        with patch.object(discord_module.time, "monotonic", return_value=1000.0):
+            await bot._send_auth_denial("C1", "U1", denial)
+            await bot._send_auth_denial("C1", "U1", denial)
+            await bot._send_auth_denial("C1", "U2", denial)
+            await bot._send_auth_denial("C2", "U1", denial)
+        with patch.object(discord_module.time, "monotonic", return_value=1031.0):
+            await bot._send_auth_denial("C1", "U1", denial)
+
+        self.assertEqual(len(sent), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.im.discord import DiscordBot
+
+
+async def _serve_file(request: web.Request) -> web.Response:
+    return web.Response(body=b"x" * 1000)
+
+
+async def _stream_file(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse()
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    for _ in range(3):
+        await response.write(b"y" * 100_000)
+    await response.write_eof()
+    return response
+
+
+async def _gzip_file(request: web.Request) -> web.Response:
+    response = web.Response(body=b"z" * 50_000)
+    response.enable_compression(web.ContentCoding.gzip)
+    return response
+
+
+def _bot() -> DiscordBot:
+    bot = object.__new__(DiscordBot)
+    bot._http_session = None
+    bot._http_session_loop = None
+    return bot
+
+
+class DiscordDownloadTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get("/file", _serve_file)
+        app.router.add_get("/stream", _stream_file)
+        app.router.add_get("/gzip", _gzip_file)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.url = str(self.server.make_url("/file"))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_downloads_share_one_http_session(self):
+        bot = _bot()
+
+        self.assertEqual(await bot.download_file({"url": self.url}), b"x" * 1000)
+        session = bot._http_session
+        self.assertEqual(await bot.download_file({"url": self.url}), b"x" * 1000)
+
+        self.assertIs(bot._http_session, session)
+        self.assertFalse(session.closed)
+        await session.close()
+
+    async def test_download_respects_max_bytes(self):
+        bot = _bot()
+
+        self.assertIsNone(await bot.download_file({"url": self.url}, max_bytes=999))
+        self.assertEqual(await bot.download_file({"url": self.url}, max_bytes=1000), b"x" * 1000)
+        await bot._http_session.close()
+
+    async def test_download_handles_missing_or_encoded_content_length(self):
+        bot = _bot()
+
+        stream_url = str(self.server.make_url("/stream"))
+        gzip_url = str(self.server.make_url("/gzip"))
+        self.assertEqual(await bot.download_file({"url": stream_url}), b"y" * 300_000)
+        self.assertIsNone(await bot.download_file({"url": stream_url}, max_bytes=250_000))
+        self.assertEqual(await bot.download_file({"url": gzip_url}, max_bytes=60_000), b"z" * 50_000)
+        await bot._http_session.close()
+
+    async def test_download_ignores_malformed_content_length(self):
+        class _Content:
+            async def iter_chunked(self, size):
+                yield b"ab"
+                yield b"cd"
+
+        class _Response:
+            status = 200
+            headers = {"Content-Length": "not-a-number"}
+            content = _Content()
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class _Session:
+            def get(self, url, timeout=None):
+                return _Response()
+
+        async def _get_http_session():
+            return _Session()
+
+        bot = _bot()
+        bot._get_http_session = _get_http_session
+
+        self.assertEqual(await bot.download_file({"url": "https://cdn.example/f"}), b"abcd")
+        self.assertEqual(await bot.download_file({"url": "https://cdn.example/f"}, max_bytes=10), b"abcd")
+        self.assertIsNone(await bot.download_file({"url": "https://cdn.example/f"}, max_bytes=3))
+
+
+if __name__ == "__main__":
+    unittest.main()
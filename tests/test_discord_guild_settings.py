@@ -5,7 +5,7 @@ import json
 import pytest
 
 from config import paths
-from config.v2_config import V2Config
+from config.v2_config import DiscordConfig, V2Config
 from config.v2_settings import GuildSettings, SettingsStore
 from modules.settings_manager import SettingsManager
 from vibe import api
@@ -282,3 +282,89 @@ def test_save_config_validates_before_migrating_discord_guild_settings(tmp_path,
         api.save_config(payload)
 
     assert SettingsStore.get_instance().has_guild_scope_for_platform("discord") is False
+
+
+def test_discord_bot_guild_filter_follows_controller_config_reload(tmp_path, monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    from core.controller import Controller
+    from modules.im.discord import DiscordBot
+
+    monkeypatch.setenv("VIBE_REMOTE_HOME", str(tmp_path))
+
+    bot = object.__new__(DiscordBot)
+    bot.settings_manager = None
+    bot.config = DiscordConfig(bot_token="discord-token", guild_allowlist=["guild-1"], guild_denylist=[])
+    bot.reload_allowlists()
+
+    assert bot._is_allowed_guild("guild-1") is True
+    assert bot._is_allowed_guild("guild-2") is False
+
+    controller = Controller.__new__(Controller)
+    controller.config = V2Config.from_payload(_config_payload())
+    controller.im_clients = {"discord": bot}
+    controller._config_mtime = None
+    controller.audio_asr_service = SimpleNamespace(config=controller.config)
+
+    latest = V2Config.from_payload(
+        {
+            **_config_payload(),
+            "discord": {
+                "bot_token": "discord-token",
+                "guild_allowlist": ["guild-1", "guild-2"],
+                "guild_denylist": ["guild-1"],
+            },
+        }
+    )
+    latest.save()
+
+    controller._refresh_config_from_disk()
+
+    assert bot._is_allowed_guild("guild-1") is False
+    assert bot._is_allowed_guild("guild-2") is True
+
+
+def test_discord_message_guild_gate_uses_freshly_reloaded_lists() -> None:
+    import asyncio
+    from types import SimpleNamespace
+
+    from modules.im.discord import DiscordBot
+
+    class _PassedGate(Exception):
+        pass
+
+    def _past_gate(channel):
+        raise _PassedGate
+
+    bot = object.__new__(DiscordBot)
+    bot.settings_manager = None
+    bot.config = SimpleNamespace(guild_allowlist=[], guild_denylist=[])
+    bot.reload_allowlists()
+    bot._extract_context_ids = _past_gate
+
+    def _deny_on_reload():
+        bot.config.guild_denylist = ["guild-1"]
+        bot.reload_allowlists()
+
+    bot._controller = SimpleNamespace(_refresh_config_from_disk=_deny_on_reload)
+    message = SimpleNamespace(
+        author=SimpleNamespace(bot=False),
+        content="hello",
+        attachments=[],
+        guild=SimpleNamespace(id="guild-1"),
+        channel=object(),
+    )
+
+    # The edit that denies guild-1 lands on this very message.
+    asyncio.run(bot._on_message_event(message))
+
+    def _allow_on_reload():
+        bot.config.guild_allowlist = ["guild-2"]
+        bot.config.guild_denylist = []
+        bot.reload_allowlists()
+
+    bot._controller = SimpleNamespace(_refresh_config_from_disk=_allow_on_reload)
+    message.guild = SimpleNamespace(id="guild-2")
+
+    with pytest.raises(_PassedGate):
+        asyncio.run(bot._on_message_event(message))
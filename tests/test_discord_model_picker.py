@@ -5,7 +5,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from modules.im.discord import _prioritize_claude_model_choices
+from modules.im.discord import _prioritize_claude_model_choices, _select_options
 
 
 def test_prioritize_pulls_aliases_ahead_of_catalog_tail():
@@ -47,3 +47,22 @@ def test_prioritized_aliases_survive_discord_25_cap():
     result = _prioritize_claude_model_choices(models, None)
 
     assert {"opus", "sonnet", "haiku"} <= set(result[:24])
+
+
+def test_select_options_are_memoized_per_choices_and_selection():
+    choices = (("English", "en"), ("中文", "zh"))
+
+    options = _select_options(choices, "zh")
+
+    assert _select_options(choices, "zh") is options
+    assert [(o.value, o.default) for o in options] == [("en", False), ("zh", True)]
+    assert _select_options(choices, "en") is not options
+
+
+def test_select_options_accept_a_frozenset_of_selected_values():
+    choices = (("System", "system"), ("Assistant", "assistant"), ("Tools", "toolcall"))
+
+    options = _select_options(choices, frozenset({"system", "toolcall"}))
+
+    assert _select_options(choices, frozenset({"toolcall", "system"})) is options
+    assert [o.default for o in options] == [True, False, True]
@@ -63,3 +63,37 @@ class DiscordReplyAnchorTests(unittest.IsolatedAsyncioTestCase):
         allowed = DiscordBot._is_thread_reply_allowed(bot, "U123", "C123", "777")
 
         self.assertTrue(allowed)
+
+    async def test_ready_event_compiles_mention_pattern_for_both_forms(self):
+        bot = object.__new__(DiscordBot)
+        bot.client = SimpleNamespace(user=SimpleNamespace(id=42), add_view=lambda view: None)
+        bot._on_ready = None
+        bot._mention_re = None
+
+        await DiscordBot._on_ready_event(bot)
+
+        self.assertEqual(bot._mention_re.sub("", "<@42> hi <@!42> <@420>").strip(), "hi  <@420>")
+
+    def test_mention_pattern_is_built_before_ready_event(self):
+        bot = object.__new__(DiscordBot)
+        bot.client = SimpleNamespace(user=None)
+        bot._mention_re = None
+
+        self.assertIsNone(bot._get_mention_re())
+
+        bot.client.user = SimpleNamespace(id=42)
+        pattern = bot._get_mention_re()
+
+        self.assertEqual(pattern.sub("", "<@!42> hi").strip(), "hi")
+        self.assertIs(bot._get_mention_re(), pattern)
+
+    def test_language_getter_is_resolved_when_controller_is_set(self):
+        bot = object.__new__(DiscordBot)
+        bot._lang_fn = None
+        self.assertEqual(bot._get_lang(), "en")
+
+        DiscordBot.set_controller(bot, SimpleNamespace(config=SimpleNamespace(language="zh")))
+        self.assertEqual(bot._get_lang(), "zh")
+
+        DiscordBot.set_controller(bot, SimpleNamespace(config=object(), _get_lang=lambda: "ja"))
+        self.assertEqual(bot._get_lang("C1"), "ja")
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import discord
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.im import discord as discord_module
+from modules.im.discord import DiscordBot
+
+
+class _FakeResponse:
+    def __init__(self):
+        self.deferred = 0
+        self.edits = 0
+        self.edit_kwargs = []
+
+    async def defer(self):
+        self.deferred += 1
+
+    async def edit_message(self, **kwargs):
+        self.edits += 1
+        self.edit_kwargs.append(kwargs)
+
+
+def _bot() -> DiscordBot:
+    bot = object.__new__(DiscordBot)
+    bot._modal_send_semaphore = asyncio.Semaphore(8)
+    bot._lang_fn = None
+    bot.settings_manager = None
+    bot._controller = None
+    return bot
+
+
+async def _open_view(bot: DiscordBot, backend: str, current_routing=None) -> discord.ui.View:
+    sent = {}
+
+    async def _send(**kwargs):
+        sent.update(kwargs)
+
+    async def _fetch_channel(channel_id):
+        return SimpleNamespace(send=_send)
+
+    bot._fetch_channel = _fetch_channel
+    await bot.open_routing_modal(
+        trigger_id=None,
+        channel_id="C1",
+        registered_backends=["opencode", "claude", "codex"],
+        current_backend=backend,
+        current_routing=current_routing,
+        opencode_agents=[{"name": "build"}, "plan", "build"],
+        opencode_models={
+            "providers": [{"id": "anthropic", "models": {"sonnet": {}, "opus": {}}}],
+            "default": {"anthropic": "sonnet"},
+        },
+        opencode_default_config={},
+        claude_agents=["reviewer"],
+        claude_models=["opus", "sonnet"],
+        codex_agents=[],
+        codex_models=["gpt-5"],
+    )
+    return sent["view"]
+
+
+def _selects(view: discord.ui.View) -> list[discord.ui.Select]:
+    return [item for item in view.children if isinstance(item, discord.ui.Select)]
+
+
+def _interaction(select: discord.ui.Select, value: str) -> SimpleNamespace:
+    select._values = [value]
+    return SimpleNamespace(response=_FakeResponse())
+
+
+class DiscordRoutingViewTests(unittest.IsolatedAsyncioTestCase):
+    async def test_opencode_step_lists_unique_agents_and_models(self):
+        view = await _open_view(_bot(), "opencode")
+
+        backend, agent, model, reasoning = _selects(view)
+        self.assertEqual([o.value for o in agent.options], ["__default__", "build", "plan"])
+        self.assertEqual([o.value for o in model.options], ["__default__", "anthropic/opus", "anthropic/sonnet"])
+        self.assertTrue(reasoning.options[0].default)
+
+    async def test_claude_model_change_resets_reasoning_and_rerenders(self):
+        view = await _open_view(_bot(), "claude", SimpleNamespace(claude_reasoning_effort="high"))
+        self.assertEqual(view.claude_reasoning, "high")
+
+        _, agent, model, _ = _selects(view)
+        interaction = _interaction(agent, "reviewer")
+        await agent.callback(interaction)
+        self.assertEqual(view.claude_agent, "reviewer")
+        self.assertEqual(interaction.response.deferred, 1)
+
+        interaction = _interaction(model, "sonnet")
+        await model.callback(interaction)
+        self.assertEqual(view.claude_model, "sonnet")
+        self.assertIsNone(view.claude_reasoning)
+        self.assertEqual(interaction.response.edits, 1)
+        self.assertTrue(next(o for o in _selects(view)[2].options if o.value == "sonnet").default)
+
+    async def test_backend_switch_rerenders_with_target_backend_selects(self):
+        view = await _open_view(_bot(), "opencode")
+
+        backend = _selects(view)[0]
+        interaction = _interaction(backend, "codex")
+        await backend.callback(interaction)
+
+        self.assertEqual(view.selected_backend, "codex")
+        self.assertEqual(interaction.response.edit_kwargs, [{"view": view}])
+        self.assertEqual([o.value for o in _selects(view)[2].options], ["__default__", "gpt-5"])
+
+    async def test_returning_to_a_rendered_state_reuses_its_items(self):
+        view = await _open_view(_bot(), "opencode")
+        opencode_items = list(view.children)
+
+        for value in ("codex", "opencode"):
+            backend = _selects(view)[0]
+            await backend.callback(_interaction(backend, value))
+
+        self.assertEqual(view.children, opencode_items)
+        self.assertEqual(len(view._rendered_items), 2)
+
+    async def test_save_button_is_reused_across_renders(self):
+        view = await _open_view(_bot(), "opencode")
+        save_button = view.children[-1]
+
+        backend = _selects(view)[0]
+        await backend.callback(_interaction(backend, "claude"))
+
+        self.assertIs(view.children[-1], save_button)
+        self.assertEqual(save_button.callback, view._on_save)
+
+    async def test_opencode_selection_state_is_resolved_once_per_agent_and_model(self):
+        resolve = discord_module.resolve_opencode_default_model
+        with patch.object(discord_module, "resolve_opencode_default_model", wraps=resolve) as resolve_default:
+            view = await _open_view(_bot(), "opencode")
+            for value in ("anthropic/opus", "__default__", "anthropic/opus"):
+                model = _selects(view)[2]
+                await model.callback(_interaction(model, value))
+
+        self.assertEqual(view.oc_model, "anthropic/opus")
+        self.assertEqual(resolve_default.call_count, 2)
+
+    async def test_routing_labels_are_translated_once_across_renders(self):
+        bot = _bot()
+        lookups = []
+        translate = bot._t
+
+        def _t(key, channel_id=None, **kwargs):
+            lookups.append(key)
+            return translate(key, channel_id, **kwargs)
+
+        bot._t = _t
+        view = await _open_view(bot, "claude")
+        for value in ("opus", "sonnet"):
+            model = _selects(view)[2]
+            await model.callback(_interaction(model, value))
+
+        self.assertEqual(lookups.count("discord.labels.model"), 1)
+        self.assertEqual(lookups.count("common.default"), 1)
+
+    async def test_save_passes_normalized_routing_values(self):
+        bot = _bot()
+        calls = []
+
+        async def _on_routing_update(*args, **kwargs):
+            calls.append((args, kwargs))
+
+        async def _dismiss(interaction, fallback_text):
+            return None
+
+        bot._on_routing_update = _on_routing_update
+        bot._dismiss_interaction_message = _dismiss
+        bot.check_authorization = lambda **kwargs: SimpleNamespace(allowed=True)
+        view = await _open_view(bot, "codex", SimpleNamespace(codex_model="gpt-5", codex_agent="__default__"))
+
+        interaction = SimpleNamespace(response=_FakeResponse(), user=SimpleNamespace(id=7), guild=None, channel_id=None)
+        await view._on_save(interaction)
+
+        args, kwargs = calls[0]
+        self.assertEqual(args[:3], ("7", "C1", "codex"))
+        self.assertEqual(args[3:], (None, None, None, None, None, None, None, "gpt-5", None))
+        self.assertEqual(kwargs, {"notify_user": True, "is_dm": True})
+
+    async def test_routing_without_instance_dict_is_read_through_getattr(self):
+        class _SlottedRouting:
+            __slots__ = ("codex_model", "codex_agent")
+
+            def __init__(self):
+                self.codex_model = "gpt-5"
+                self.codex_agent = "__default__"
+
+        bot = _bot()
+        calls = []
+
+        async def _on_routing_update(*args, **kwargs):
+            calls.append(args)
+
+        async def _dismiss(interaction, fallback_text):
+            return None
+
+        bot._on_routing_update = _on_routing_update
+        bot._dismiss_interaction_message = _dismiss
+        bot.check_authorization = lambda **kwargs: SimpleNamespace(allowed=True)
+        view = await _open_view(bot, "codex", _SlottedRouting())
+
+        interaction = SimpleNamespace(response=_FakeResponse(), user=SimpleNamespace(id=7), guild=None, channel_id=None)
+        await view._on_save(interaction)
+
+        self.assertEqual(calls[0][3:], (None, None, None, None, None, None, None, "gpt-5", None))
+
+    async def test_save_dismisses_before_update_and_reports_failure_as_followup(self):
+        bot = _bot()
+        events = []
+
+        async def _on_routing_update(*args, **kwargs):
+            events.append("update")
+            raise RuntimeError("db locked")
+
+        async def _dismiss(interaction, fallback_text):
+            events.append("dismiss")
+
+        async def _followup_send(**kwargs):
+            events.append(("followup", kwargs["ephemeral"]))
+
+        bot._on_routing_update = _on_routing_update
+        bot._dismiss_interaction_message = _dismiss
+        bot.check_authorization = lambda **kwargs: SimpleNamespace(allowed=True)
+        view = await _open_view(bot, "codex")
+
+        interaction = SimpleNamespace(
+            response=_FakeResponse(),
+            followup=SimpleNamespace(send=_followup_send),
+            user=SimpleNamespace(id=7),
+            guild=None,
+            channel_id=None,
+        )
+        await view._on_save(interaction)
+
+        self.assertEqual(events, ["dismiss", "update", ("followup", True)])
+
+    async def test_reselecting_current_value_defers_without_rerender(self):
+        view = await _open_view(_bot(), "claude", SimpleNamespace(claude_model="opus", claude_reasoning_effort="high"))
+        children = list(view.children)
+
+        model = _selects(view)[2]
+        interaction = _interaction(model, "opus")
+        await model.callback(interaction)
+
+        self.assertEqual(interaction.response.deferred, 1)
+        self.assertEqual(interaction.response.edits, 0)
+        self.assertEqual(view.claude_reasoning, "high")
+        self.assertEqual(list(view.children), children)
+
+    async def test_agent_and_reasoning_options_are_shared_across_views(self):
+        first = await _open_view(_bot(), "opencode")
+        second = await _open_view(_bot(), "opencode")
+
+        _, first_agent, _, first_reasoning = _selects(first)
+        _, second_agent, _, second_reasoning = _selects(second)
+        self.assertIs(first_agent.options[0], second_agent.options[0])
+        self.assertIs(first_reasoning.options[0], second_reasoning.options[0])
+
+    async def test_settings_modal_translates_each_label_prefix_once(self):
+        bot = _bot()
+        sent = {}
+        lookups = []
+        translate = bot._t
+
+        def _t(key, channel_id=None, **kwargs):
+            lookups.append(key)
+            return translate(key, channel_id, **kwargs)
+
+        async def _send(**kwargs):
+            sent.update(kwargs)
+
+        async def _fetch_channel(channel_id):
+            return SimpleNamespace(send=_send)
+
+        bot._t = _t
+        bot._fetch_channel = _fetch_channel
+        await bot.open_settings_modal(
+            trigger_id=None,
+            user_settings=SimpleNamespace(show_message_types=["system"]),
+            message_types=["system", "assistant", "toolcall"],
+            display_names={"system": "System"},
+            channel_id="C1",
+        )
+
+        types_select = _selects(sent["view"])[0]
+        self.assertEqual([o.default for o in types_select.options], [True, False, False])
+        self.assertEqual(lookups.count("discord.labels.messageTypes"), 1)
+        self.assertEqual(lookups.count("discord.labels.mentionPolicy"), 1)
+        self.assertEqual(lookups.count("discord.labels.language"), 1)
+
+    async def test_interaction_is_deferred_before_view_and_sent_as_followup(self):
+        bot = _bot()
+        events = []
+        sent = {}
+
+        class _Response:
+            def is_done(self):
+                return bool(events)
+
+            async def defer(self, ephemeral=False):
+                events.append(("defer", ephemeral))
+
+        async def _followup_send(**kwargs):
+            events.append(("followup", kwargs["ephemeral"]))
+            sent.update(kwargs)
+
+        interaction = object.__new__(discord.Interaction)
+        interaction._cs_response = _Response()
+        interaction._cs_followup = SimpleNamespace(send=_followup_send)
+        interaction.user = SimpleNamespace(id=42)
+
+        await bot.open_routing_modal(
+            trigger_id=interaction,
+            channel_id="C1",
+            registered_backends=["codex"],
+            current_backend="codex",
+            current_routing=None,
+            opencode_agents=[],
+            opencode_models={},
+            opencode_default_config={},
+            claude_agents=[],
+            claude_models=[],
+            codex_agents=[],
+            codex_models=["gpt-5"],
+        )
+
+        self.assertEqual(events, [("defer", True), ("followup", True)])
+        self.assertEqual(sent["view"].owner_id, "42")
+
+
+if __name__ == "__main__":
+    unittest.main()
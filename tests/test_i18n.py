@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from vibe.i18n import I18n
+
+
+def test_translate_memoizes_templates_and_interpolates_per_call():
+    i18n = I18n()
+    i18n._translations = {"en": {"greet": "Hi {name}"}, "zh": {}}
+    i18n._templates = {}
+
+    assert i18n.t("greet", "zh", name="Ann") == "Hi Ann"
+    assert i18n.t("greet", "zh", name="Bo") == "Hi Bo"
+    assert i18n.t("missing.key", "zh") == "missing.key"
+    assert i18n._templates == {("zh", "greet"): "Hi {name}", ("zh", "missing.key"): "missing.key"}
+
+
+def test_reload_drops_memoized_templates():
+    i18n = I18n()
+    i18n.t("common.save", "en")
+    assert i18n._templates
+
+    i18n._load_translations()
+
+    assert i18n._templates == {}
@@ -99,6 +99,21 @@ class MessageDispatcherPlatformLimitTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(all(len(text.encode("utf-8")) <= 1900 for _, _, text, _ in controller.im_client.sent))
         self.assertEqual(controller.im_client.edit_calls, [])
 
+    async def test_long_log_message_batch_send_failure_is_logged_not_raised(self):
+        controller = _StubController("wechat")
+        dispatcher = ConsolidatedMessageDispatcher(controller)
+        context = MessageContext(user_id="wechat-user", channel_id="wechat-user", platform="wechat")
+
+        async def _send_many(context, texts):
+            raise RuntimeError("client loop closed")
+
+        controller.im_client.send_many = _send_many
+
+        with self.assertLogs("core.message_dispatcher", level="ERROR"):
+            message_id = await dispatcher.emit_agent_message(context, "assistant", "x" * 5000)
+
+        self.assertIsNone(message_id)
+
     async def test_wechat_log_messages_send_individually_without_append_edit(self):
         controller = _StubController("wechat")
         dispatcher = ConsolidatedMessageDispatcher(controller)
@@ -14,7 +14,7 @@ from config.v2_sessions import ActivePollInfo
 from core.processing_indicator import ProcessingIndicatorService
 from modules.agents.base import AgentRequest
 from modules.agents.opencode.agent import OpenCodeAgent
-from modules.agents.opencode.poll_loop import OpenCodePollLoop
+from modules.agents.opencode.poll_loop import OpenCodePollLoop, _first_new_message_index
 
 
 @dataclass
@@ -82,7 +82,9 @@ class _StubClient(BaseIMClient):
         return FileDownloadResult(True, target_path)
 
     async def clear_typing_indicator(self, context):
-        self.sent.append(("clear_typing", context.platform, context.user_id, (context.platform_specific or {}).get("context_token")))
+        self.sent.append(
+            ("clear_typing", context.platform, context.user_id, (context.platform_specific or {}).get("context_token"))
+        )
         return True
 
     async def delete_message(self, context, message_id):
@@ -282,6 +284,18 @@ def test_opencode_prompt_disables_question_tool_for_all_platforms():
         def mark_initialized(self, session_id):
             return False
 
+        def pop_fresh_session(self, session_id):
+            return False
+
+        def mark_verified(self, session_id):
+            return None
+
+        def forget_verified(self, session_id):
+            return None
+
+        def pop_unchecked_session(self, session_id):
+            return False
+
     class _Sessions:
         def add_active_poll(self, **kwargs):
             return None
@@ -367,6 +381,121 @@ def test_opencode_prompt_disables_question_tool_for_all_platforms():
     assert calls[0]["reasoning_effort"] == "high"
 
 
+def test_opencode_trusted_session_missing_on_prompt_reports_expiry():
+    emitted = []
+    forgotten = []
+    lookups = []
+
+    class _Server:
+        async def ensure_running(self):
+            return None
+
+        async def list_messages(self, session_id, directory):
+            return []
+
+        async def prompt_async(self, **kwargs):
+            raise RuntimeError("OpenCode request failed: 404")
+
+        async def get_session(self, session_id, directory, raise_on_error=False):
+            lookups.append(session_id)
+            return None
+
+        async def abort_session(self, session_id, directory):
+            raise AssertionError("a missing session is not aborted")
+
+        def get_default_agent_from_config(self):
+            return None
+
+        def get_agent_model_from_config(self, _agent):
+            return None
+
+        def get_agent_reasoning_effort_from_config(self, _agent):
+            return None
+
+    class _SessionManager:
+        async def ensure_working_dir(self, path):
+            return None
+
+        async def get_or_create_session_id(self, request, server):
+            return "oc-session"
+
+        def set_request_session(self, *args):
+            return None
+
+        def mark_initialized(self, session_id):
+            return False
+
+        def pop_fresh_session(self, session_id):
+            return False
+
+        def forget_verified(self, session_id):
+            forgotten.append(session_id)
+
+        def pop_unchecked_session(self, session_id):
+            return True
+
+    class _Controller:
+        def __init__(self):
+            self.config = type(
+                "Config",
+                (),
+                {
+                    "platform": "slack",
+                    "reply_enhancements": True,
+                    "show_pages_prompt": True,
+                    "remote_access": None,
+                    "language": "en",
+                },
+            )()
+            self.im_client = _StubClient("slack")
+
+        def get_opencode_overrides(self, context):
+            return None, None, None
+
+        async def emit_agent_message(self, context, message_type, text, **kwargs):
+            emitted.append((message_type, text, kwargs))
+
+    async def _get_server():
+        return _Server()
+
+    async def _async_noop():
+        return None
+
+    agent = OpenCodeAgent.__new__(OpenCodeAgent)
+    agent.controller = _Controller()
+    agent.config = agent.controller.config
+    agent.im_client = agent.controller.im_client
+    agent.opencode_config = type("OpenCodeConfig", (), {"error_retry_limit": 0})()
+    agent._session_manager = _SessionManager()
+    agent._get_server = _get_server
+    agent._delete_ack = lambda request: _async_noop()
+    agent._remove_ack_reaction = lambda request: _async_noop()
+
+    request = AgentRequest(
+        context=MessageContext(
+            user_id="u",
+            channel_id="c",
+            platform="slack",
+            platform_specific={"agent_session_id": "ses_test"},
+        ),
+        message="hello",
+        working_path="/tmp/work",
+        base_session_id="base",
+        composite_session_id="base:/tmp/work",
+        session_key="slack::c",
+    )
+
+    asyncio.run(agent._process_message(request))
+
+    assert forgotten == ["oc-session"]
+    assert lookups == ["oc-session"]
+    assert len(emitted) == 1
+    message_type, text, kwargs = emitted[0]
+    assert message_type == "result"
+    assert "Could not resume the previous OpenCode session (oc-session)" in text
+    assert kwargs == {"is_error": True}
+
+
 def test_opencode_normal_text_matching_legacy_question_prefix_is_processed():
     processed = []
 
@@ -454,6 +583,18 @@ def test_opencode_process_message_removes_active_poll_when_question_tool_aborts(
         def mark_initialized(self, session_id):
             return False
 
+        def pop_fresh_session(self, session_id):
+            return False
+
+        def mark_verified(self, session_id):
+            return None
+
+        def forget_verified(self, session_id):
+            return None
+
+        def pop_unchecked_session(self, session_id):
+            return False
+
     class _Sessions:
         def add_active_poll(self, **kwargs):
             return None
@@ -540,7 +681,9 @@ def test_opencode_poll_aborts_disabled_question_toolcall():
         def _t(self, key):
             return f"translated:{key}"
 
-        async def emit_agent_message(self, context, message_type, text, parse_mode=None, *, is_error=False, level="normal"):
+        async def emit_agent_message(
+            self, context, message_type, text, parse_mode=None, *, is_error=False, level="normal"
+        ):
             emitted.append((message_type, text))
 
     class _Agent:
@@ -631,7 +774,9 @@ def test_opencode_poll_emits_error_result_on_retry_exhaustion():
         def _t(self, key):
             return f"translated:{key}"
 
-        async def emit_agent_message(self, context, message_type, text, parse_mode=None, *, is_error=False, level="normal"):
+        async def emit_agent_message(
+            self, context, message_type, text, parse_mode=None, *, is_error=False, level="normal"
+        ):
             emitted.append((message_type, is_error))
 
     class _Agent:
@@ -785,7 +930,9 @@ def test_processing_indicator_message_delete_policy_comes_from_platform_registry
             "ack_message_channel_id": "chat-1",
         }
     )
-    request = type("Request", (), {"context": handle.context, "ack_message_id": "ack-1", "processing_indicator": handle})()
+    request = type(
+        "Request", (), {"context": handle.context, "ack_message_id": "ack-1", "processing_indicator": handle}
+    )()
 
     asyncio.run(service.delete_ack_message(request))
 
@@ -827,9 +974,7 @@ def test_multi_im_client_routes_dismiss_form_message_by_context_platform():
     client = MultiIMClient({"slack": slack, "lark": lark}, primary_platform="slack")
 
     asyncio.run(
-        client.dismiss_form_message(
-            MessageContext(user_id="u", channel_id="c", platform="lark", message_id="om_456")
-        )
+        client.dismiss_form_message(MessageContext(user_id="u", channel_id="c", platform="lark", message_id="om_456"))
     )
 
     assert slack.dismissed == []
@@ -864,3 +1009,109 @@ def test_multi_im_client_on_ready_fires_only_after_all_platforms():
     # Calling again should not fire a second time
     asyncio.run(wechat_on_ready())
     assert len(ready_calls) == 1, "on_ready should not fire more than once"
+
+
+def test_opencode_poll_skips_baseline_prefix():
+    messages = [{"info": {"id": f"msg-{index}"}} for index in range(5)]
+
+    assert _first_new_message_index(messages, {"msg-0", "msg-1", "msg-2"}) == 3
+    assert _first_new_message_index(messages, set()) == 0
+    assert _first_new_message_index(messages, {"msg-4"}) == 5
+    assert _first_new_message_index(messages, {"unknown"}) == 0
+
+
+def test_opencode_prewarm_starts_server_once_and_swallows_errors():
+    calls: list[str] = []
+
+    class _Server:
+        def __init__(self, error=None):
+            self.error = error
+
+        async def ensure_running(self):
+            calls.append("ensure_running")
+            if self.error:
+                raise self.error
+            return "http://127.0.0.1:4096"
+
+    servers = [_Server(), _Server(RuntimeError("boom"))]
+
+    async def _get_server():
+        return servers.pop(0)
+
+    agent = OpenCodeAgent.__new__(OpenCodeAgent)
+    agent._warmup_task = None
+    agent._get_server = _get_server
+
+    async def _run():
+        agent.prewarm()
+        first = agent._warmup_task
+        agent.prewarm()
+        assert agent._warmup_task is first
+        await first
+
+        agent.prewarm()
+        assert agent._warmup_task is not first
+        await agent._warmup_task
+
+    asyncio.run(_run())
+
+    assert calls == ["ensure_running", "ensure_running"]
+
+
+def test_opencode_clear_sessions_aborts_matching_runs_concurrently():
+    from modules.agents.opencode.session import OpenCodeSessionManager
+
+    aborted: list[str] = []
+    removed: list[str] = []
+
+    in_flight = {"now": 0, "peak": 0}
+
+    async def _run():
+        class _Server:
+            async def abort_session(self, session_id, directory):
+                aborted.append(session_id)
+                in_flight["now"] += 1
+                in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+                await asyncio.sleep(0.01)
+                in_flight["now"] -= 1
+                return True
+
+        async def _get_server():
+            return _Server()
+
+        class _Sessions:
+            def clear_agent_sessions(self, session_key, agent_name):
+                return None
+
+            def remove_active_poll(self, session_id):
+                removed.append(session_id)
+
+        agent = OpenCodeAgent.__new__(OpenCodeAgent)
+        agent.sessions = _Sessions()
+        agent._get_server = _get_server
+        agent._session_manager = OpenCodeSessionManager(type("Settings", (), {})(), "opencode")
+        agent._active_requests = {}
+        for base_id, session_key in (("base-1", "slack::c"), ("base-2", "slack::c"), ("base-3", "slack::other")):
+            agent._active_requests[base_id] = asyncio.create_task(asyncio.sleep(60))
+            agent._session_manager.set_request_session(base_id, f"oc-{base_id}", "/tmp/work", session_key)
+
+        terminated = await agent.clear_sessions("slack::c")
+
+        assert not agent._active_requests["base-3"].done()
+        agent._active_requests["base-3"].cancel()
+        return terminated
+
+    assert asyncio.run(_run()) == 2
+    assert in_flight["peak"] == 2
+    assert sorted(aborted) == ["oc-base-1", "oc-base-2"]
+    assert sorted(removed) == ["oc-base-1", "oc-base-2"]
+
+
+def test_opencode_relative_path_returns_non_string_tool_input_unchanged():
+    from modules.agents.opencode.message_processor import OpenCodeMessageProcessorMixin, relative_path_under
+
+    processor = OpenCodeMessageProcessorMixin()
+
+    assert processor._to_relative_path(["a.py"], "/tmp/work") == ["a.py"]
+    assert relative_path_under(["a.py"], "/tmp/work") == ["a.py"]
+    assert processor._to_relative_path("/tmp/work/src/app.py", "/tmp/work") == "./src/app.py"
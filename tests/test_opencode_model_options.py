@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modules.agents.opencode.utils import build_opencode_model_option_items
+
+
+def _models() -> dict:
+    return {
+        "providers": [
+            {"id": "anthropic", "name": "Anthropic", "models": {f"claude-{i}": {} for i in range(8)}},
+            {"id": "openai", "name": "OpenAI", "models": {f"gpt-{i}": {} for i in range(8)}},
+            {"id": "local", "models": ["llama"]},
+        ],
+        "default": {"openai": "gpt-0"},
+    }
+
+
+def test_model_options_stop_at_max_total():
+    options = build_opencode_model_option_items(_models(), max_total=7)
+
+    assert len(options) == 7
+    assert all(option["value"].startswith("anthropic/") for option in options[:5])
+
+
+def test_model_options_respect_allowed_and_preferred_providers():
+    options = build_opencode_model_option_items(
+        _models(),
+        max_total=24,
+        preferred_providers=["openai"],
+        allowed_providers=["openai", "local"],
+    )
+
+    values = [option["value"] for option in options]
+    assert values[0].startswith("openai/")
+    assert values[-1] == "local/llama"
+    assert not any(value.startswith("anthropic/") for value in values)
+    assert "OpenAI: gpt-0 (default)" in [option["label"] for option in options]
@@ -16,6 +16,8 @@ def _load_server_module():
     aiohttp_stub = types.ModuleType("aiohttp")
     aiohttp_stub.ClientSession = object
     aiohttp_stub.ClientTimeout = object
+    aiohttp_stub.TCPConnector = lambda **kwargs: types.SimpleNamespace(**kwargs)
+    aiohttp_stub.DummyCookieJar = lambda: types.SimpleNamespace(dummy=True)
     previous_aiohttp = sys.modules.get("aiohttp")
     sys.modules["aiohttp"] = aiohttp_stub
     try:
@@ -53,7 +55,7 @@ class _FakeResponse:
     async def read(self):
         return self._text.encode()
 
-    async def json(self):
+    async def json(self, **kwargs):
         return self._json_data if self._json_data is not None else {}
 
 
@@ -113,6 +115,165 @@ class OpenCodeServerTests(unittest.IsolatedAsyncioTestCase):
         body = fake_session.posts[0]["json"]
         self.assertEqual(body["tools"], {"question": False})
 
+    async def test_list_messages_decodes_raw_body_with_and_without_orjson(self):
+        class _MessagesSession(_FakeSession):
+            def get(self, url, headers=None, timeout=None):
+                self.gets.append({"url": url, "headers": headers, "timeout": timeout})
+                return _FakeResponse(status=200, text='[{"info": {"id": "msg-1", "role": "assistant"}}]')
+
+        manager = OpenCodeServerManager(binary="opencode", port=4096)
+        fake_session = _MessagesSession()
+
+        async def _fake_get_http_session():
+            return fake_session
+
+        manager._get_http_session = _fake_get_http_session  # type: ignore[method-assign]
+
+        expected = [{"info": {"id": "msg-1", "role": "assistant"}}]
+        self.assertEqual(await manager.list_messages("ses-1", "/tmp/work"), expected)
+        with patch.object(SERVER_MODULE, "orjson", None):
+            self.assertEqual(await manager.list_messages("ses-1", "/tmp/work"), expected)
+        self.assertEqual(fake_session.gets[0]["headers"], {"x-opencode-directory": "/tmp/work"})
+
+    def test_encode_json_matches_stdlib_with_and_without_orjson(self):
+        import json
+
+        payload = {"parts": [{"type": "text", "text": "héllo"}], "agent": None}
+        self.assertEqual(json.loads(SERVER_MODULE._encode_json(payload)), payload)
+        with patch.object(SERVER_MODULE, "orjson", None):
+            self.assertEqual(json.loads(SERVER_MODULE._encode_json(payload)), payload)
+
+    async def test_directory_headers_are_reused_and_bounded(self):
+        manager = OpenCodeServerManager(binary="opencode", port=4096)
+
+        headers = manager._headers_for("/tmp/work")
+        self.assertIs(manager._headers_for("/tmp/work"), headers)
+        self.assertEqual(headers, {"x-opencode-directory": "/tmp/work"})
+
+        with patch.object(SERVER_MODULE, "DIRECTORY_HEADERS_CACHE_MAX", 1):
+            manager._headers_for("/tmp/other")
+        self.assertEqual(list(manager._directory_headers), ["/tmp/other"])
+
+    async def _run_start_server(self, health_results, *, returncode=None):
+        manager = OpenCodeServerManager(binary="opencode", port=4096)
+        manager._write_pid_file = lambda pid: None  # type: ignore[method-assign]
+        manager._clear_pid_file = lambda: None  # type: ignore[method-assign]
+        manager._is_healthy = AsyncMock(side_effect=health_results)  # type: ignore[method-assign]
+        process = types.SimpleNamespace(pid=4321, returncode=returncode)
+        delays = []
+
+        async def _fake_sleep(delay):
+            delays.append(delay)
+
+        with (
+            patch.object(SERVER_MODULE.asyncio, "create_subprocess_exec", AsyncMock(return_value=process)),
+            patch.object(SERVER_MODULE.asyncio, "sleep", _fake_sleep),
+        ):
+            await manager._start_server()
+        return manager, delays
+
+    async def test_start_server_probes_readiness_with_backoff(self):
+        manager, delays = await self._run_start_server([False] * 6 + [True])
+
+        self.assertEqual(manager.base_url, "http://127.0.0.1:4096")
+        self.assertEqual(delays, [0.025, 0.05, 0.1, 0.2, 0.25, 0.25])
+
+    async def test_start_server_fails_fast_when_process_exits(self):
+        with self.assertRaisesRegex(RuntimeError, "exited during startup"):
+            await self._run_start_server([False], returncode=1)
+
+    async def test_http_session_uses_bounded_keepalive_pool(self):
+        manager = OpenCodeServerManager(binary="opencode", port=4096)
+        fake_session = _FakeSession()
+
+        with (
+            patch.object(SERVER_MODULE.aiohttp, "ClientSession", return_value=fake_session) as session_cls,
+            patch.object(SERVER_MODULE.aiohttp, "ClientTimeout", return_value=object()),
+        ):
+            session = await manager._get_http_session()
+            again = await manager._get_http_session()
+
+        self.assertIs(session, fake_session)
+        self.assertIs(again, fake_session)
+        session_cls.assert_called_once()
+        connector = session_cls.call_args.kwargs["connector"]
+        self.assertEqual(connector.limit, SERVER_MODULE.HTTP_POOL_LIMIT)
+        self.assertEqual(connector.limit_per_host, SERVER_MODULE.HTTP_POOL_LIMIT_PER_HOST)
+        self.assertEqual(connector.keepalive_timeout, SERVER_MODULE.HTTP_KEEPALIVE_TIMEOUT)
+        self.assertTrue(session_cls.call_args.kwargs["cookie_jar"].dummy)
+
+    def _healthy_manager(self):
+        class _HealthSession(_FakeSession):
+            def get(self, url, headers=None, timeout=None):
+                self.gets.append({"url": url, "headers": headers, "timeout": timeout})
+                return _FakeResponse(status=200, json_data={"healthy": True})
+
+        manager = OpenCodeServerManager(binary="opencode", port=4096)
+        fake_session = _HealthSession()
+
+        async def _fake_get_http_session():
+            return fake_session
+
+        manager._get_http_session = _fake_get_http_session  # type: ignore[method-assign]
+        manager._cleanup_orphaned_managed_server = AsyncMock()  # type: ignore[method-assign]
+        manager._read_pid_file = lambda: {"pid": 4321}  # type: ignore[method-assign]
+        return manager, fake_session
+
+    async def test_ensure_running_reuses_recent_health_probe(self):
+        manager, fake_session = self._healthy_manager()
+
+        with patch.object(SERVER_MODULE.aiohttp, "ClientTimeout", return_value=object()):
+            self.assertEqual(await manager.ensure_running(), "http://127.0.0.1:4096")
+            self.assertEqual(await manager.ensure_running(), "http://127.0.0.1:4096")
+
+        self.assertEqual(len(fake_session.gets), 1)
+        manager._cleanup_orphaned_managed_server.assert_awaited_once()
+
+    async def test_ensure_running_probes_again_after_health_ttl(self):
+        manager, fake_session = self._healthy_manager()
+
+        with patch.object(SERVER_MODULE.aiohttp, "ClientTimeout", return_value=object()):
+            await manager.ensure_running()
+            manager._last_healthy_ts -= SERVER_MODULE.HEALTH_CHECK_TTL_SECONDS
+            await manager.ensure_running()
+
+        self.assertEqual(len(fake_session.gets), 2)
+
+    async def test_ensure_running_skips_lock_while_health_is_fresh(self):
+        manager, _fake_session = self._healthy_manager()
+
+        with patch.object(SERVER_MODULE.aiohttp, "ClientTimeout", return_value=object()):
+            await manager.ensure_running()
+
+        lock = manager._get_lock()
+        async with lock:
+            # Would deadlock if the fresh-health fast path still took the lock.
+            self.assertEqual(await manager.ensure_running(), "http://127.0.0.1:4096")
+
+        manager._auth_refresh_pending = True
+        manager._restart_for_auth_refresh_locked = AsyncMock()  # type: ignore[method-assign]
+        await manager.ensure_running()
+        manager._restart_for_auth_refresh_locked.assert_awaited_once()
+
+    async def test_is_healthy_checks_body_only_in_strict_mode(self):
+        class _UnhealthyBodySession(_FakeSession):
+            def get(self, url, headers=None, timeout=None):
+                self.gets.append({"url": url, "headers": headers, "timeout": timeout})
+                return _FakeResponse(status=200, json_data={"healthy": False})
+
+        manager = OpenCodeServerManager(binary="opencode", port=4096)
+        fake_session = _UnhealthyBodySession()
+
+        async def _fake_get_http_session():
+            return fake_session
+
+        manager._get_http_session = _fake_get_http_session  # type: ignore[method-assign]
+
+        with patch.object(SERVER_MODULE.aiohttp, "ClientTimeout", return_value=object()):
+            self.assertTrue(await manager._is_healthy())
+            manager._strict_health = True
+            self.assertFalse(await manager._is_healthy())
+
     async def test_load_opencode_user_config_supports_jsonc(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_home = Path(tmp_dir)
@@ -180,7 +341,9 @@ class OpenCodeServerTests(unittest.IsolatedAsyncioTestCase):
                 refreshed = await manager.refresh_global_config()
 
             self.assertTrue(refreshed)
-            self.assertTrue(fake_session.closed)
+            # The refresh rides the pooled session instead of a throwaway one.
+            self.assertIs(manager._http_session, fake_session)
+            self.assertFalse(fake_session.closed)
             self.assertEqual(len(fake_session.gets), 1)
             self.assertEqual(len(fake_session.patches), 1)
             self.assertEqual(
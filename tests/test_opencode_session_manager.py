@@ -225,3 +225,160 @@ def test_session_facade_ensure_fallback_does_not_clear_existing_native_session()
 
     assert facade.ensure_agent_session_id("slack::channel::C1", "codex", "base-1") is None
     assert facade.get_agent_session_id("slack::channel::C1", "base-1", "codex") == "thread-old"
+
+
+def test_ensure_working_dir_creates_missing_and_tolerates_existing(tmp_path) -> None:
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=SimpleNamespace()), "opencode")
+    target = tmp_path / "nested" / "workdir"
+
+    asyncio.run(manager.ensure_working_dir(str(target)))
+    asyncio.run(manager.ensure_working_dir(str(target)))
+
+    assert target.is_dir()
+
+
+def test_ensure_working_dir_skips_makedirs_for_known_path(monkeypatch, tmp_path) -> None:
+    import modules.agents.opencode.session as session_module
+
+    makedirs = Mock()
+    monkeypatch.setattr(session_module.os, "makedirs", makedirs)
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=SimpleNamespace()), "opencode")
+
+    asyncio.run(manager.ensure_working_dir(str(tmp_path)))
+    asyncio.run(manager.ensure_working_dir(str(tmp_path)))
+
+    makedirs.assert_called_once_with(str(tmp_path), exist_ok=True)
+
+
+def test_mark_initialized_is_bounded_lru(monkeypatch) -> None:
+    import modules.agents.opencode.session as session_module
+
+    monkeypatch.setattr(session_module, "_INITIALIZED_SESSIONS_MAX", 2)
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=SimpleNamespace()), "opencode")
+
+    assert manager.mark_initialized("ses-a") is True
+    assert manager.mark_initialized("ses-b") is True
+    # Touching "ses-a" makes "ses-b" the eviction candidate.
+    assert manager.mark_initialized("ses-a") is False
+    assert manager.mark_initialized("ses-c") is True
+
+    assert list(manager._initialized_sessions) == ["ses-a", "ses-c"]
+    assert manager.mark_initialized("ses-b") is True
+
+
+def test_recently_verified_session_skips_server_lookup(monkeypatch) -> None:
+    import modules.agents.opencode.session as session_module
+
+    sessions = SimpleNamespace(
+        get_agent_session_id=Mock(return_value="oc-session-1"),
+        ensure_agent_session_id=Mock(return_value="sesk8m4q2p7x"),
+        bind_agent_session=Mock(return_value="sesk8m4q2p7x"),
+    )
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=sessions), "opencode")
+    server = SimpleNamespace(get_session=AsyncMock(return_value={"id": "oc-session-1"}))
+
+    assert asyncio.run(manager.get_or_create_session_id(_request(), server)) == "oc-session-1"
+    assert asyncio.run(manager.get_or_create_session_id(_request(), server)) == "oc-session-1"
+    server.get_session.assert_awaited_once()
+
+    monkeypatch.setattr(session_module, "_SESSION_VERIFY_TTL_SECONDS", 0.0)
+    assert asyncio.run(manager.get_or_create_session_id(_request(), server)) == "oc-session-1"
+    assert server.get_session.await_count == 2
+
+
+def test_created_session_is_fresh_exactly_once() -> None:
+    sessions = SimpleNamespace(
+        get_agent_session_id=Mock(return_value=None),
+        ensure_agent_session_id=Mock(return_value="sesk8m4q2p7x"),
+        bind_agent_session=Mock(return_value="sesk8m4q2p7x"),
+    )
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=sessions), "opencode")
+    server = SimpleNamespace(create_session=AsyncMock(return_value={"id": "oc-session-1"}))
+
+    assert asyncio.run(manager.get_or_create_session_id(_request(), server)) == "oc-session-1"
+
+    assert manager.pop_fresh_session("oc-session-1") is True
+    assert manager.pop_fresh_session("oc-session-1") is False
+
+
+def test_session_lock_is_shared_while_held_and_dropped_after() -> None:
+    import gc
+
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=SimpleNamespace()), "opencode")
+
+    lock = manager.get_session_lock("base-1")
+    assert manager.get_session_lock("base-1") is lock
+
+    del lock
+    gc.collect()
+    assert "base-1" not in manager._session_locks
+
+
+def test_forget_verified_forces_next_lookup() -> None:
+    sessions = SimpleNamespace(
+        get_agent_session_id=Mock(return_value="oc-session-1"),
+        ensure_agent_session_id=Mock(return_value="sesk8m4q2p7x"),
+        bind_agent_session=Mock(return_value="sesk8m4q2p7x"),
+    )
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=sessions), "opencode")
+    server = SimpleNamespace(get_session=AsyncMock(return_value=None))
+
+    manager.mark_verified("oc-session-1")
+    assert asyncio.run(manager.get_or_create_session_id(_request(), server)) == "oc-session-1"
+    server.get_session.assert_not_awaited()
+
+    manager.forget_verified("oc-session-1")
+    with pytest.raises(OpenCodeResumeUnavailableError):
+        asyncio.run(manager.get_or_create_session_id(_request(), server))
+
+
+def test_trusted_session_is_unchecked_until_next_server_lookup(monkeypatch) -> None:
+    import modules.agents.opencode.session as session_module
+
+    sessions = SimpleNamespace(
+        get_agent_session_id=Mock(return_value="oc-session-1"),
+        ensure_agent_session_id=Mock(return_value="sesk8m4q2p7x"),
+        bind_agent_session=Mock(return_value="sesk8m4q2p7x"),
+    )
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=sessions), "opencode")
+    server = SimpleNamespace(get_session=AsyncMock(return_value={"id": "oc-session-1"}))
+
+    manager.mark_verified("oc-session-1")
+    asyncio.run(manager.get_or_create_session_id(_request(), server))
+    assert manager.pop_unchecked_session("oc-session-1") is True
+    assert manager.pop_unchecked_session("oc-session-1") is False
+
+    asyncio.run(manager.get_or_create_session_id(_request(), server))
+    monkeypatch.setattr(session_module, "_SESSION_VERIFY_TTL_SECONDS", 0.0)
+    asyncio.run(manager.get_or_create_session_id(_request(), server))
+    assert manager.pop_unchecked_session("oc-session-1") is False
+
+
+def test_wait_for_session_idle_backs_off_between_polls(monkeypatch) -> None:
+    import modules.agents.opencode.session as session_module
+
+    busy = [{"info": {"role": "assistant", "time": {}}}]
+    server = SimpleNamespace(list_messages=AsyncMock(side_effect=[busy, busy, busy, []]))
+    sleeps: list[float] = []
+
+    async def _fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(session_module.asyncio, "sleep", _fake_sleep)
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=SimpleNamespace()), "opencode")
+
+    asyncio.run(manager.wait_for_session_idle(server, "oc-session-1", "/repo"))
+
+    assert sleeps == [0.05, 0.1, 0.2]
+    assert server.list_messages.await_count == 4
+
+
+def test_request_sessions_are_named_records() -> None:
+    manager = OpenCodeSessionManager(SimpleNamespace(sessions=SimpleNamespace()), "opencode")
+
+    manager.set_request_session("base-1", "oc-1", "/repo", "slack::C1")
+    manager.set_request_session("base-2", "oc-2", "/repo", "slack::C2")
+
+    info = manager.get_request_session("base-1")
+    assert (info.opencode_session_id, info.working_path, info.session_key) == ("oc-1", "/repo", "slack::C1")
+    assert list(manager.pop_all_for_session_key("slack::C2")) == ["base-2"]
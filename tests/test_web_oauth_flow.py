@@ -70,6 +70,21 @@ def test_opencode_message_text_extractor_ignores_non_text_by_default() -> None:
     )
 
 
+def test_opencode_message_text_extractor_joins_stripped_text_parts_only() -> None:
+    message = {
+        "parts": [
+            {"type": "text", "text": "  first  "},
+            {"type": "reasoning", "text": "hidden"},
+            {"type": "text", "text": "   "},
+            "not-a-part",
+            {"type": "text", "text": "second\n"},
+        ]
+    }
+
+    assert extract_opencode_response_text(message) == "first\n\nsecond"
+    assert extract_opencode_response_text(message, allow_non_text_fallback=True) == "first\n\nsecond"
+
+
 def test_unsupported_backend_raises(service: AgentAuthService) -> None:
     with pytest.raises(ValueError, match="unsupported_backend"):
         _run(service.start_web_setup("gemini"))
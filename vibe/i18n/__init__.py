@@ -13,6 +13,7 @@ class I18n:
 
     _instance: Optional["I18n"] = None
     _translations: Dict[str, Dict[str, Any]] = {}
+    _templates: Dict[tuple[str, str], str] = {}
 
     def __init__(self):
         self._load_translations()
@@ -34,6 +35,7 @@ class I18n:
         """Load all translation files from the i18n directory."""
         i18n_dir = Path(__file__).parent
         self._translations = {}
+        self._templates = {}
         for lang_file in i18n_dir.glob("*.json"):
             lang = lang_file.stem
             try:
@@ -58,6 +60,22 @@ class I18n:
         Returns:
             Translated string, or key if not found
         """
+        # Resolved templates are memoized per (lang, key); only interpolation
+        # runs on repeat lookups.
+        cache_key = (lang, key)
+        value = self._templates.get(cache_key)
+        if value is None:
+            value = self._templates[cache_key] = self._resolve(key, lang)
+
+        # Interpolate variables: {name} -> value of kwargs["name"]
+        if kwargs:
+            for k, v in kwargs.items():
+                value = value.replace(f"{{{k}}}", str(v))
+
+        return value
+
+    def _resolve(self, key: str, lang: str) -> str:
+        """Return the untranslated template for ``key``, falling back to English, then the key."""
         # Get translations for the requested language, fallback to English
         translations = self._translations.get(lang)
         if translations is None:
@@ -72,7 +90,7 @@ class I18n:
                 if value is None:
                     # Key not found, try English fallback
                     if lang != "en":
-                        return self.t(key, "en", **kwargs)
+                        return self._resolve(key, "en")
                     return key
             else:
                 return key
@@ -80,11 +98,6 @@ class I18n:
         if not isinstance(value, str):
             return key
 
-        # Interpolate variables: {name} -> value of kwargs["name"]
-        if kwargs:
-            for k, v in kwargs.items():
-                value = value.replace(f"{{{k}}}", str(v))
-
         return value
 
 